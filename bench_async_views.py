@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark: sync (tasks.views) vs async (tasks.async_views) views.
+
+Both variants are driven through the same ASGI request handler with N
+concurrent clients, against a throwaway test database seeded with tasks.
+The fragment cache is disabled so every request reaches the database.
+
+Usage:
+    python bench_async_views.py --tasks 2000 --concurrency 50 --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import types
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import AsyncClient, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import path  # noqa: E402
+
+from tasks import async_views, views  # noqa: E402
+from tasks import urls as tasks_urls  # noqa: E402
+from tasks.models import Task  # noqa: E402
+
+
+def make_urlconf(name, module):
+    """Register an in-memory URLconf serving the task pages from `module`."""
+    swapped = {"list": module.index, "update_task": module.updateTask, "delete_task": module.deleteTask}
+    urlconf = types.ModuleType(name)
+    urlconf.urlpatterns = [
+        path(str(pattern.pattern), swapped.get(pattern.name, pattern.callback), name=pattern.name)
+        for pattern in tasks_urls.urlpatterns
+    ]
+    sys.modules[name] = urlconf
+    return name
+
+
+async def run_load(paths, concurrency, total):
+    """Issue `total` GETs spread over `concurrency` clients; returns (seconds, latencies)."""
+    latencies = []
+    remaining = total
+
+    async def client_loop():
+        nonlocal remaining
+        client = AsyncClient()
+        while remaining > 0:
+            remaining -= 1
+            url = paths[remaining % len(paths)]
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {url} returned {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies
+
+
+def summarize(mode, elapsed, latencies):
+    ordered = sorted(latencies)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 2)
+
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks seeded in the test database.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode.")
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        Task.objects.bulk_create(
+            Task(title=f"Benchmark task {i}", complete=i % 3 == 0) for i in range(args.tasks)
+        )
+        sample = list(Task.objects.values_list("pk", flat=True)[:20])
+        paths = ["/", "/?status=open"] + [f"/update_task/{pk}/" for pk in sample]
+
+        results = []
+        for mode, module in (("sync", views), ("async", async_views)):
+            urlconf = make_urlconf(f"bench_{mode}_urls", module)
+            with override_settings(ROOT_URLCONF=urlconf, TASKS_LIST_CACHE_TIMEOUT=0):
+                asyncio.run(run_load(paths, args.concurrency, min(args.requests, 50)))  # warm-up
+                elapsed, latencies = asyncio.run(run_load(paths, args.concurrency, args.requests))
+            results.append(summarize(mode, elapsed, latencies))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(json.dumps({
+        "tasks": args.tasks,
+        "concurrency": args.concurrency,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
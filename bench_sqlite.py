@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Multi-process SQLite contention benchmark: default settings vs the production
+profile (todo.settings.production: WAL, busy_timeout, mmap, synchronous=NORMAL
+and locked-write retries).
+
+Each profile gets a fresh database file. N processes then start together and
+each performs M operations (one task insert followed by one read of the first
+list page), and the benchmark reports throughput and "database is locked"
+failures as JSON.
+
+Usage:
+    python bench_sqlite.py --processes 8 --operations 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+PROFILES = (
+    ("default", "todo.settings"),
+    ("production", "todo.settings.production"),
+)
+# The production profile refuses to start without a key.
+os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only-not-secret")
+
+
+def _setup(db_path, settings_module):
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = db_path
+
+    import django
+
+    django.setup()
+
+
+def _migrate(db_path, settings_module):
+    _setup(db_path, settings_module)
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def _worker(db_path, settings_module, operations, start, results):
+    _setup(db_path, settings_module)
+    from django.db import OperationalError, connection
+
+    from tasks.db import retry_on_locked
+    from tasks.models import Task
+
+    def create(i):
+        Task.objects.create(title=f"Contention task {os.getpid()}-{i}")
+
+    if settings_module != "todo.settings":
+        create = retry_on_locked(create)
+
+    done = locked = 0
+    start.wait()
+    for i in range(operations):
+        try:
+            create(i)
+            list(Task.objects.order_by("-created", "-id")[:50])
+            done += 1
+        except OperationalError:
+            locked += 1
+    connection.close()
+    results.put((done, locked))
+
+
+def run_profile(name, settings_module, processes, operations):
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite3")
+        migrate = ctx.Process(target=_migrate, args=(db_path, settings_module))
+        migrate.start()
+        migrate.join()
+
+        start = ctx.Event()
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(target=_worker, args=(db_path, settings_module, operations, start, results))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        time.sleep(2)  # let every worker finish django.setup()
+        started = time.perf_counter()
+        start.set()
+        totals = [results.get() for _ in workers]
+        elapsed = time.perf_counter() - started
+        for worker in workers:
+            worker.join()
+
+    done = sum(result[0] for result in totals)
+    locked = sum(result[1] for result in totals)
+    return {
+        "profile": name,
+        "operations_ok": done,
+        "locked_errors": locked,
+        "seconds": round(elapsed, 2),
+        "throughput_ops": round(done / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=8, help="Concurrent writer processes.")
+    parser.add_argument("--operations", type=int, default=300, help="Write+read operations per process.")
+    args = parser.parse_args()
+
+    results = [run_profile(name, module, args.processes, args.operations) for name, module in PROFILES]
+    print(json.dumps({"processes": args.processes, "operations": args.operations, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
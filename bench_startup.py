@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Startup and middleware benchmark of the settings profiles (todo.settings,
+todo.settings.serve, todo.settings.admin).
+
+For each profile it reports, as JSON:
+- setup_ms: median time of django.setup() plus loading the WSGI handler and
+  the URLconf, in a fresh interpreter (what a new worker pays before its
+  first request), and process_ms, the same including interpreter startup;
+- import_ms / modules: total self time and number of the modules imported
+  meanwhile, from `python -X importtime`, with the slowest top-level imports;
+- middleware_us: median per-request cost of the middleware chain, i.e. a
+  request through the full handler minus the same request with MIDDLEWARE
+  emptied (GET /metrics, which touches neither the database nor templates).
+
+No database is needed.
+
+Usage:
+    python bench_startup.py --runs 7 --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# The production profiles refuse to start without a key.
+os.environ.setdefault("DJANGO_SECRET_KEY", "bench-only-not-secret")
+
+PROFILES = (
+    ("default", "todo.settings"),
+    ("serve", "todo.settings.serve"),
+    ("admin", "todo.settings.admin"),
+)
+
+# Run with `python -c`, so the measure includes no import of this script.
+STARTUP = """
+import os, sys, time
+os.environ["DJANGO_SETTINGS_MODULE"] = sys.argv[1]
+started = time.perf_counter()
+import django
+django.setup()
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import get_resolver
+WSGIHandler()
+get_resolver().url_patterns
+print(time.perf_counter() - started)
+"""
+
+
+def _run_startup(settings_module, *flags):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", STARTUP, settings_module],
+        capture_output=True, text=True, check=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+
+def measure_setup(settings_module, runs):
+    setup, process = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = _run_startup(settings_module)
+        process.append(time.perf_counter() - started)
+        setup.append(float(result.stdout))
+    return round(statistics.median(setup) * 1000, 1), round(statistics.median(process) * 1000, 1)
+
+
+def measure_imports(settings_module, top=8):
+    """Parse `-X importtime` lines: "import time: self [us] | cumulative | name"."""
+    result = _run_startup(settings_module, "-X", "importtime")
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level.
+        modules.append((name[1:], int(own), int(cumulative)))
+    top_level = sorted((m for m in modules if not m[0].startswith(" ")), key=lambda m: m[2], reverse=True)
+    return {
+        "import_ms": round(sum(m[1] for m in modules) / 1000, 1),
+        "modules": len(modules),
+        "slowest_imports": [{"module": name, "cumulative_ms": round(cumulative / 1000, 1)} for name, _, cumulative in top_level[:top]],
+    }
+
+
+def _middleware_worker(settings_module, requests, results):
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.core.handlers.base import BaseHandler
+    from django.test import RequestFactory
+    from django.test.utils import override_settings
+
+    def handler(middleware):
+        with override_settings(MIDDLEWARE=middleware):
+            base = BaseHandler()
+            base.load_middleware()
+        return base
+
+    def per_request(base):
+        factory = RequestFactory(HTTP_HOST="localhost")
+        timings = []
+        for _ in range(requests):
+            request = factory.get("/metrics")
+            started = time.perf_counter()
+            base.get_response(request)
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    full, bare = handler(settings.MIDDLEWARE), handler([])
+    per_request(full), per_request(bare)  # warm up
+    results.put({
+        "middleware": len(settings.MIDDLEWARE),
+        "installed_apps": len(settings.INSTALLED_APPS),
+        "request_us": round(per_request(full) * 1e6, 1),
+        "middleware_us": round((per_request(full) - per_request(bare)) * 1e6, 1),
+    })
+
+
+def measure_middleware(settings_module, requests):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    worker = ctx.Process(target=_middleware_worker, args=(settings_module, requests, results))
+    worker.start()
+    result = results.get()
+    worker.join()
+    return result
+
+
+def run_profile(name, settings_module, runs, requests):
+    setup_ms, process_ms = measure_setup(settings_module, runs)
+    return {
+        "profile": name,
+        "settings": settings_module,
+        "setup_ms": setup_ms,
+        "process_ms": process_ms,
+        **measure_imports(settings_module),
+        **measure_middleware(settings_module, requests),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters started per profile.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests timed per middleware measure.")
+    parser.add_argument("--profile", action="append", choices=[name for name, _ in PROFILES], help="Only this profile (repeatable).")
+    args = parser.parse_args()
+
+    profiles = [profile for profile in PROFILES if not args.profile or profile[0] in args.profile]
+    results = [run_profile(name, module, args.runs, args.requests) for name, module in profiles]
+    print(json.dumps({"runs": args.runs, "requests": args.requests, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ set -euo pipefail
 
 # ---- Config ----
 APP_NAME="todolist"
-SETTINGS_FILE="todo/settings.py"
+SETTINGS_FILE="todo/settings/base.py"
 
 # ---- Parse arguments ----
 if [ "$#" -lt 1 ]; then
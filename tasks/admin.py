@@ -1,6 +1,13 @@
 from django.contrib import admin
 
 # Register your models here.
+from tasks.counters import task_counts
 from tasks.models import Task
 
-admin.site.register(Task)
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    def changelist_view(self, request, extra_context=None):
+        counts = task_counts()
+        extra_context = {"subtitle": f"{counts['open']} open / {counts['done']} done", **(extra_context or {})}
+        return super().changelist_view(request, extra_context=extra_context)
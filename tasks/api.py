@@ -0,0 +1,237 @@
+"""
+JSON API over tasks.
+
+Single-task endpoints mirror the form views; the batch endpoint applies many
+create / update / delete operations in one request and one transaction,
+validated with the same TaskForm rules.
+
+The views are exempt from CSRF, so request bodies must be application/json:
+browsers preflight that content type on cross-site requests, which the API
+does not answer, whereas a text/plain or form POST from another site would be
+sent without one.
+"""
+
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods, require_POST
+
+from tasks import journal
+from tasks.cache import bump_version
+from tasks.db import retry_on_locked
+from tasks.events import publish_refresh
+from tasks.filters import MAX_ID, filter_by_status, get_status
+from tasks.forms import TaskForm
+from tasks.models import Task, TaskChange
+from tasks.pagination import paginate_keyset
+
+
+class ApiError(Exception):
+    def __init__(self, errors, status=400):
+        super().__init__(errors)
+        self.errors = errors
+        self.status = status
+
+
+def serialize_task(task):
+    return {
+        "id": task.pk,
+        "title": task.title,
+        "complete": task.complete,
+        "created": task.created.isoformat(),
+        "modified": task.modified.isoformat(),
+    }
+
+
+def _read_json(request):
+    if request.content_type != "application/json":
+        raise ApiError({"body": ["Expected an application/json body."]}, status=415)
+    try:
+        return json.loads(request.body or b"null")
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ApiError({"body": [f"Invalid JSON: {exc}"]}) from exc
+
+
+def _is_id(value):
+    """Whether `value` is a task id: a JSON integer (true/false are bools, not ids)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _validated(data, instance=None):
+    """Return an unsaved Task built from `data` with TaskForm rules, or raise ApiError."""
+    if not isinstance(data, dict):
+        raise ApiError({"__all__": ["Expected a JSON object."]})
+    if instance is not None:
+        data = {"title": instance.title, "complete": instance.complete, **data}
+    form = TaskForm(data=data, instance=instance)
+    if not form.is_valid():
+        raise ApiError(form.errors.get_json_data())
+    return form.save(commit=False)
+
+
+def _api_view(view):
+    """Turn ApiError into JSON error responses and exempt the view from CSRF."""
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as exc:
+            return JsonResponse({"errors": exc.errors}, status=exc.status)
+
+    return wrapper
+
+
+@_api_view
+@require_http_methods(["GET", "POST"])
+@retry_on_locked
+def apiTasks(request):
+    """GET: keyset-paginated list (?status=, ?after=, ?before=). POST: create one task."""
+    if request.method == "POST":
+        task = _validated(_read_json(request))
+        task.save()
+        return JsonResponse(serialize_task(task), status=201)
+
+    page = paginate_keyset(
+        filter_by_status(Task.objects.all(), get_status(request.GET)),
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+        page_size=getattr(settings, "TASKS_PAGE_SIZE", 50),
+    )
+    return JsonResponse({
+        "results": [serialize_task(task) for task in page],
+        "next": page.next_cursor,
+        "previous": page.previous_cursor,
+    })
+
+
+@_api_view
+@require_http_methods(["GET", "PATCH", "DELETE"])
+@retry_on_locked
+def apiTask(request, pk):
+    """GET, PATCH or DELETE a single task."""
+    task = Task.objects.filter(pk=pk).first()
+    if task is None:
+        raise ApiError({"id": [f"Unknown task id: {pk}"]}, status=404)
+
+    if request.method == "PATCH":
+        task = _validated(_read_json(request), instance=task)
+        task.save()
+    elif request.method == "DELETE":
+        task.delete()
+        return HttpResponse(status=204)
+    return JsonResponse(serialize_task(task))
+
+
+@_api_view
+@require_POST
+@retry_on_locked
+def apiTaskBatch(request):
+    """
+    Apply {"create": [...], "update": [{"id": ..., ...}], "delete": [ids]} atomically.
+
+    Every operation is validated first; if any fails, nothing is written and the
+    errors are returned keyed by operation and position.
+    """
+    payload = _read_json(request)
+    if not isinstance(payload, dict):
+        raise ApiError({"__all__": ["Expected a JSON object."]})
+    creates = payload.get("create") or []
+    updates = payload.get("update") or []
+    deletes = payload.get("delete") or []
+    if not all(isinstance(ops, list) for ops in (creates, updates, deletes)):
+        raise ApiError({"__all__": ["create, update and delete must be lists."]})
+
+    max_batch = getattr(settings, "TASKS_API_MAX_BATCH", 1000)
+    if len(creates) + len(updates) + len(deletes) > max_batch:
+        raise ApiError({"__all__": [f"A batch may contain at most {max_batch} operations."]}, status=413)
+
+    errors = {}
+    new_tasks = []
+    for index, data in enumerate(creates):
+        try:
+            new_tasks.append(_validated(data))
+        except ApiError as exc:
+            errors.setdefault("create", {})[index] = exc.errors
+
+    update_ids = [data.get("id") for data in updates if isinstance(data, dict)]
+    existing = Task.objects.in_bulk([pk for pk in update_ids if _is_id(pk)])
+    now = timezone.now()
+    changed_tasks = []
+    for index, data in enumerate(updates):
+        pk = data.get("id") if isinstance(data, dict) else None
+        task = existing.get(pk) if _is_id(pk) else None
+        if task is None:
+            errors.setdefault("update", {})[index] = {"id": [f"Unknown task id: {pk}"]}
+            continue
+        try:
+            task = _validated({key: value for key, value in data.items() if key != "id"}, instance=task)
+        except ApiError as exc:
+            errors.setdefault("update", {})[index] = exc.errors
+            continue
+        # bulk_update bypasses auto_now.
+        task.modified = now
+        changed_tasks.append(task)
+
+    delete_ids = [pk for pk in deletes if _is_id(pk)]
+    if len(delete_ids) != len(deletes):
+        errors["delete"] = ["Task ids must be integers."]
+
+    if errors:
+        raise ApiError(errors)
+
+    with transaction.atomic(), journal.batched():
+        created = Task.objects.bulk_create(new_tasks)
+        Task.objects.bulk_update(changed_tasks, ["title", "complete", "modified"])
+        # Bulk writes and a raw DELETE send no per-task signal.
+        doomed = Task.objects.filter(pk__in=delete_ids)
+        journal.record_queryset(TaskChange.DELETED, doomed)
+        deleted = doomed._raw_delete(doomed.db)
+        journal.record(TaskChange.CREATED, [task.pk for task in created])
+        journal.record(TaskChange.UPDATED, [task.pk for task in changed_tasks])
+        bump_version()
+        transaction.on_commit(bump_version)
+        transaction.on_commit(publish_refresh)
+
+    return JsonResponse({
+        "created": [serialize_task(task) for task in created],
+        "updated": [serialize_task(task) for task in changed_tasks],
+        "deleted": deleted,
+    })
+
+
+@_api_view
+@require_http_methods(["GET"])
+def apiSync(request):
+    """
+    Changes since ?since=<cursor> (omitted: from the start of the journal).
+
+    Returns {"changes": [...], "cursor": ..., "has_more": ...}; each change is
+    the task's current state or a tombstone ({"id": ..., "deleted": true}).
+    Clients store "cursor" and call again while "has_more" is true. A cursor
+    older than the compacted part of the journal gets a 410: sync from scratch.
+    """
+    since = request.GET.get("since") or "0"
+    try:
+        cursor = int(since)
+    except ValueError:
+        cursor = None
+    # Cursors are journal ids: a negative one would read as expired (410).
+    if cursor is None or not 0 <= cursor <= MAX_ID:
+        raise ApiError({"since": [f"Invalid cursor: {since}"]})
+
+    try:
+        changes, cursor, has_more = journal.changes_since(cursor, getattr(settings, "TASKS_SYNC_PAGE_SIZE", 1000))
+    except journal.CursorExpired:
+        raise ApiError({"since": ["Cursor expired, sync again without since."]}, status=410) from None
+
+    for change in changes:
+        if not change["deleted"]:
+            change["task"] = serialize_task(change["task"])
+    return JsonResponse({"changes": changes, "cursor": cursor, "has_more": has_more})
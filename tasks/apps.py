@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from django.core import checks
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from tasks import signals  # noqa: F401
+        from tasks.db import configure_sqlite
+        from tasks.metrics import instrument_connection
+        from tasks.triggers import check_triggers, ensure_triggers
+
+        connection_created.connect(configure_sqlite, dispatch_uid="tasks.configure_sqlite")
+        connection_created.connect(instrument_connection, dispatch_uid="tasks.instrument_connection")
+        post_migrate.connect(ensure_triggers, sender=self, dispatch_uid="tasks.ensure_triggers")
+        checks.register(check_triggers, checks.Tags.database)
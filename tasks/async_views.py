@@ -0,0 +1,233 @@
+"""
+Native async versions of the task views, for deployments on todo.asgi.
+
+They behave like tasks.views but use the async ORM, so under an ASGI server a
+request waiting on the database does not hold a worker thread. Writes run in
+a thread with retry_on_locked, like the sync views, since its backoff sleeps.
+Enabled with the TASKS_ASYNC_VIEWS setting (see tasks.urls).
+
+taskEvents, the Server-Sent Events stream of task changes, is always routed
+but only streams under ASGI.
+"""
+
+import asyncio
+import datetime
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.utils.safestring import mark_safe
+from django.views.decorators.cache import cache_control
+
+from tasks.cache import acached_fragment, acached_value, aget_version
+from tasks.counters import atask_counts
+from tasks.db import retry_on_locked
+from tasks.events import get_broker
+from tasks.filters import filter_by_status, get_status, list_url
+from tasks.forms import TaskForm
+from tasks.models import Task
+from tasks.pagination import apaginate_keyset
+from tasks.search import get_query, paginate_search, search_terms
+from tasks.views import _errors_response, _list_validator, _row_response, _task_validator, _wants_fragment
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """
+    Async counterpart of django.views.decorators.http.condition, whose
+    validator functions are coroutines (they may query the database).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            last_modified = await last_modified_func(request, *args, **kwargs) if last_modified_func else None
+            if last_modified is not None:
+                if not timezone.is_aware(last_modified):
+                    last_modified = timezone.make_aware(last_modified, datetime.timezone.utc)
+                last_modified = int(last_modified.timestamp())
+            etag = await etag_func(request, *args, **kwargs) if etag_func else None
+            etag = quote_etag(etag) if etag is not None else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+            return response
+
+        return inner
+
+    return decorator
+
+
+async def _alist_etag(request):
+    return _list_validator(request, await aget_version())
+
+
+async def _atask_modified(request, pk):
+    if not hasattr(request, "_task_modified"):
+        request._task_modified = await Task.objects.filter(pk=pk).values_list("modified", flat=True).afirst()
+    return request._task_modified
+
+
+async def _atask_etag(request, pk):
+    return _task_validator(request, pk, await _atask_modified(request, pk))
+
+
+async def _atask_last_modified(request, pk):
+    return await _atask_modified(request, pk)
+
+
+@cache_control(private=True, no_cache=True)
+@acondition(etag_func=_alist_etag)
+async def index(request):
+    status = get_status(request.GET)
+    query = get_query(request.GET)
+    after = request.GET.get("after")
+    before = request.GET.get("before")
+    page_size = getattr(settings, "TASKS_PAGE_SIZE", 50)
+    form = TaskForm()
+
+    if request.method == 'POST':
+        form = TaskForm(request.POST)
+        if form.is_valid():
+            task = form.save(commit=False)
+            await sync_to_async(retry_on_locked(task.save))()
+            if _wants_fragment(request):
+                return _row_response(request, task, status, code=201)
+            return redirect(list_url(status))
+        if _wants_fragment(request):
+            return _errors_response(form)
+
+    async def render_rows():
+        if search_terms(query):
+            page = await sync_to_async(paginate_search)(query, status, after=after, before=before, page_size=page_size)
+        else:
+            page = await apaginate_keyset(
+                filter_by_status(Task.objects.all(), status),
+                after=after,
+                before=before,
+                page_size=page_size,
+            )
+        return render_to_string(
+            'tasks/task_rows.html', {'tasks': page.items, 'page': page, 'status': status, 'q': query},
+        )
+
+    task_rows = await acached_fragment(("list", status, query, after, before, page_size), render_rows)
+
+    context = {
+        'task_rows': mark_safe(task_rows),
+        'status': status,
+        'q': query,
+        'counts': await acached_value(("counts",), atask_counts),
+        'form': form,
+        'app_version': getattr(settings, "APP_VERSION", "dev"),
+        'live_updates': isinstance(request, ASGIRequest),
+    }
+    return render(request, 'tasks/list.html', context)
+
+
+@cache_control(private=True, no_cache=True)
+@acondition(etag_func=_atask_etag, last_modified_func=_atask_last_modified)
+async def updateTask(request, pk):
+    status = get_status(request.GET)
+    task = await Task.objects.aget(id=pk)
+    form = TaskForm(instance=task)
+
+    if request.method == "POST":
+        form = TaskForm(request.POST, instance=task)
+        if form.is_valid():
+            await sync_to_async(retry_on_locked(form.save))()
+            if _wants_fragment(request):
+                return _row_response(request, task, status)
+            return redirect(list_url(status))
+        if _wants_fragment(request):
+            return _errors_response(form)
+
+    context = {
+        'form': form,
+        'task': task,
+        'list_url': list_url(status),
+    }
+    return render(request, 'tasks/update_task.html', context)
+
+
+@cache_control(private=True, no_cache=True)
+@acondition(etag_func=_atask_etag, last_modified_func=_atask_last_modified)
+async def deleteTask(request, pk):
+    status = get_status(request.GET)
+    item = await Task.objects.aget(id=pk)
+
+    if request.method == "POST":
+        await sync_to_async(retry_on_locked(item.delete))()
+        if _wants_fragment(request):
+            return HttpResponse(status=204)
+        return redirect(list_url(status))
+
+    context = {
+        'item': item,
+        'list_url': list_url(status),
+    }
+    return render(request, 'tasks/delete.html', context)
+
+
+def _sse_message(event):
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+class _EventStream:
+    """
+    Async iterator over the SSE messages of one client's subscription.
+
+    Its close() is called by Django when the response is closed (client gone,
+    server shutting down), which ends the subscription.
+    """
+
+    def __init__(self, broker, heartbeat):
+        self.broker = broker
+        self.heartbeat = heartbeat
+        self.queue = broker.subscribe()
+        self.started = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.started:
+            self.started = True
+            return "retry: 5000\n\n"
+        try:
+            event = await asyncio.wait_for(self.queue.get(), self.heartbeat)
+        except asyncio.TimeoutError:
+            # Comment line: keeps proxies from closing an idle stream.
+            return ": keepalive\n\n"
+        return _sse_message(event)
+
+    def close(self):
+        self.broker.unsubscribe(self.queue)
+
+
+async def taskEvents(request):
+    """Stream created / updated / deleted / refresh events to the list page."""
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be held for the whole life of the stream.
+        return HttpResponse("Live updates require the ASGI server (todo.asgi).",
+                            status=501, content_type="text/plain")
+
+    heartbeat = getattr(settings, "TASKS_SSE_HEARTBEAT", 15)
+    response = StreamingHttpResponse(_EventStream(get_broker(), heartbeat), content_type="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,238 @@
+"""
+Latency benchmarks of the task views, run by `manage.py bench`.
+
+Each scenario issues requests against one view, either through the Django
+test client (in-process, with per-request query counts) or over real HTTP
+with concurrent clients against a local threaded server. Results are
+reported in the layout of result_test_auto.json and can be compared to a
+stored baseline.
+"""
+
+import http.client
+import itertools
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+from urllib.parse import urlencode
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.cache import cache_stats, reset_cache_stats
+from tasks.models import Task
+
+WORDS = (
+    "courses", "école", "réviser", "appeler", "médecin", "facture", "banque",
+    "jardin", "réparer", "vélo", "rendez-vous", "dossier", "courrier", "ménage",
+)
+SCENARIOS = ("list", "list_open", "search", "create", "update", "delete")
+DEFAULT_TOLERANCE = 0.25
+
+
+class Scenario(NamedTuple):
+    name: str
+    view: str
+    method: str
+    # Called with the request index; returns (path, POST data or None).
+    request: Callable[[int], tuple]
+
+
+def seed(count, batch_size=2000):
+    """Insert `count` tasks with French-like titles, a third of them done."""
+    rng = random.Random(count)
+    for start in range(0, count, batch_size):
+        Task.objects.bulk_create(
+            Task(title=" ".join(rng.choices(WORDS, k=4)) + f" {i}", complete=i % 3 == 0)
+            for i in range(start, min(start + batch_size, count))
+        )
+
+
+def build_scenarios(requests):
+    """Scenarios for the list, create, update and delete views; seeds the tasks `delete` consumes."""
+    pks = list(Task.objects.order_by("-pk").values_list("pk", flat=True)[:100])
+    doomed = [task.pk for task in Task.objects.bulk_create(Task(title=f"Bench delete {i}") for i in range(requests))]
+    doomed_lock = threading.Lock()
+
+    def next_doomed(_):
+        with doomed_lock:
+            return reverse("delete_task", args=[doomed.pop()]), {}
+
+    return [
+        Scenario("list", "index", "GET", lambda i: (reverse("list"), None)),
+        Scenario("list_open", "index", "GET", lambda i: (f"{reverse('list')}?status=open", None)),
+        Scenario("search", "index", "GET", lambda i: (f"{reverse('list')}?{urlencode({'q': WORDS[i % len(WORDS)]})}", None)),
+        Scenario("create", "index", "POST", lambda i: (reverse("list"), {"title": f"Bench task {i}"})),
+        Scenario(
+            "update", "updateTask", "POST",
+            lambda i: (reverse("update_task", args=[pks[i % len(pks)]]), {"title": f"Updated {i}", "complete": i % 2 == 1}),
+        ),
+        Scenario("delete", "deleteTask", "POST", next_doomed),
+    ]
+
+
+def summarize(scenario, mode, latencies, elapsed, queries=None, concurrency=1):
+    # The client and the local server run in this process: the cache counters
+    # reset by run_client / run_http are the scenario's.
+    ordered = sorted(latencies)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 2)
+
+    return {
+        "bench_id": f"{scenario.name}:{mode}",
+        "scenario": scenario.name,
+        "view": scenario.view,
+        "method": scenario.method,
+        "mode": mode,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "queries_per_request": None if queries is None else round(queries / len(latencies), 2),
+        "cache_hit_ratio": round(cache_stats()["hit_ratio"], 3),
+    }
+
+
+def run_client(scenario, requests):
+    """Run `scenario` sequentially through the test client, counting queries."""
+    client = Client()
+    latencies = []
+    queries = 0
+    reset_cache_stats()
+    started = time.perf_counter()
+    for i in range(requests):
+        path, data = scenario.request(i)
+        with CaptureQueriesContext(connection) as captured:
+            begin = time.perf_counter()
+            response = client.post(path, data) if scenario.method == "POST" else client.get(path)
+            latencies.append(time.perf_counter() - begin)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{scenario.method} {path} returned {response.status_code}")
+        queries += len(captured)
+    return summarize(scenario, "client", latencies, time.perf_counter() - started, queries=queries)
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    # Headers and body are written separately: without this, Nagle's algorithm
+    # and the client's delayed ACK add ~40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServer:
+    """Threaded WSGI server of this project on an ephemeral local port."""
+
+    def __init__(self, host="127.0.0.1"):
+        self.httpd = ThreadedWSGIServer((host, 0), _QuietRequestHandler, allow_reuse_address=False)
+        self.httpd.set_app(WSGIHandler())
+        self.host, self.port = self.httpd.server_address[:2]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _csrf_cookie(server):
+    conn = http.client.HTTPConnection(server.host, server.port, timeout=30)
+    conn.request("GET", reverse("list"))
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    for header, value in response.getheaders():
+        if header.lower() == "set-cookie" and value.startswith("csrftoken="):
+            return value.split(";", 1)[0].split("=", 1)[1]
+    return ""
+
+
+def run_http(scenario, requests, concurrency, server):
+    """Run `scenario` with `concurrency` HTTP clients sharing `requests` requests."""
+    token = _csrf_cookie(server)
+    reset_cache_stats()
+    counter = itertools.count()
+    latencies = []
+    lock = threading.Lock()
+
+    def client_loop():
+        conn = http.client.HTTPConnection(server.host, server.port, timeout=30)
+        try:
+            while (i := next(counter)) < requests:
+                path, data = scenario.request(i)
+                headers = {"Cookie": f"csrftoken={token}", "X-CSRFToken": token}
+                body = None
+                if data is not None:
+                    body = urlencode(data)
+                    headers["Content-Type"] = "application/x-www-form-urlencoded"
+                begin = time.perf_counter()
+                conn.request(scenario.method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                elapsed = time.perf_counter() - begin
+                if response.status >= 400:
+                    raise RuntimeError(f"{scenario.method} {path} returned {response.status}")
+                with lock:
+                    latencies.append(elapsed)
+        finally:
+            conn.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(client_loop) for _ in range(concurrency)]:
+            future.result()
+    return summarize(scenario, "http", latencies, time.perf_counter() - started, concurrency=concurrency)
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Mark each result "passed", "regressed" or "new" against `baseline` (a
+    previous report); returns the list of regression messages.
+
+    Latency may grow and throughput shrink by `tolerance` (a fraction); query
+    counts are deterministic, so any increase is a regression.
+    """
+    previous = {entry["bench_id"]: entry for entry in baseline.get("benchmarks", [])}
+    regressions = []
+    for result in results:
+        base = previous.get(result["bench_id"])
+        if base is None:
+            result["status"] = "new"
+            continue
+        problems = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if base.get(metric) and result[metric] > base[metric] * (1 + tolerance):
+                problems.append(f"{metric} {result[metric]} > {base[metric]}")
+        if base.get("throughput_rps") and result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            problems.append(f"throughput_rps {result['throughput_rps']} < {base['throughput_rps']}")
+        if base.get("queries_per_request") is not None and result["queries_per_request"] is not None:
+            if result["queries_per_request"] > base["queries_per_request"]:
+                problems.append(f"queries_per_request {result['queries_per_request']} > {base['queries_per_request']}")
+        result["status"] = "regressed" if problems else "passed"
+        regressions += [f"{result['bench_id']}: {problem}" for problem in problems]
+    return regressions
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_report(path, payload):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
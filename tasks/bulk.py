@@ -0,0 +1,54 @@
+"""
+Bulk complete / reopen / delete over a task queryset.
+
+Matching tasks are processed by primary-key chunks, each in its own short
+transaction, so large selections never hold SQLite's write lock for long.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from tasks import journal
+from tasks.cache import bump_version
+from tasks.events import publish_refresh
+from tasks.models import Task, TaskChange
+
+ACTIONS = ("complete", "reopen", "delete")
+
+
+def iter_pk_chunks(queryset, chunk_size):
+    """Yield lists of at most `chunk_size` primary keys of `queryset`, in pk order."""
+    last = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last).order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield pks
+        last = pks[-1]
+
+
+def apply_bulk_action(queryset, action, chunk_size=500):
+    """Apply `action` to every task of `queryset`; returns the number of tasks changed."""
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown bulk action: {action!r}")
+
+    affected = 0
+    for pks in iter_pk_chunks(queryset, chunk_size):
+        with transaction.atomic(), journal.batched():
+            chunk = Task.objects.filter(pk__in=pks)
+            if action == "delete":
+                # A raw DELETE: QuerySet.delete() would send post_delete (cache
+                # bump, journal entry, event) once per task, inside the transaction.
+                journal.record_queryset(TaskChange.DELETED, chunk)
+                count = chunk._raw_delete(chunk.db)
+            else:
+                complete = action == "complete"
+                changed = list(chunk.exclude(complete=complete).values_list("pk", flat=True))
+                # update() bypasses auto_now and sends no post_save signal.
+                count = Task.objects.filter(pk__in=changed).update(complete=complete, modified=timezone.now())
+                journal.record(TaskChange.UPDATED, changed)
+            bump_version()
+            transaction.on_commit(bump_version)
+            transaction.on_commit(publish_refresh)
+        affected += count
+    return affected
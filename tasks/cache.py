@@ -0,0 +1,170 @@
+"""
+Cache of the rendered task-list fragment.
+
+Fragments are keyed on a task-set version counter stored in the cache and
+bumped whenever a Task is written (see tasks.signals), so a stale fragment is
+never served and no explicit invalidation is needed. Works with any Django
+cache backend (local-memory, file-based, database, ...), but the version must
+live in a cache shared by every process serving the list: a local-memory
+cache only sees the writes of its own process, so other workers would keep
+serving stale fragments and ETags (todo.settings.production uses a
+file-based cache for that reason).
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = "tasks:version"
+FRAGMENT_KEY_PREFIX = "tasks:fragment:"
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_cache():
+    return caches[getattr(settings, "TASKS_CACHE_ALIAS", "default")]
+
+
+def _seed():
+    # Seeding from the clock means an evicted counter never revisits an old version.
+    return time.time_ns() // 1000
+
+
+def get_version():
+    """Return the current task-set version, initializing it if needed."""
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _seed(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aget_version():
+    """Async counterpart of `get_version`."""
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, _seed(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached fragment by moving to a new task-set version."""
+    cache = get_cache()
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        version = _seed()
+        cache.set(VERSION_KEY, version, timeout=None)
+        return version
+
+
+def _fragment_key(version, key_parts):
+    raw_key = ":".join(str(part) for part in (version, *key_parts))
+    return FRAGMENT_KEY_PREFIX + hashlib.md5(raw_key.encode()).hexdigest()
+
+
+def cached_fragment(key_parts, render):
+    """
+    Return the HTML produced by `render()` for `key_parts` at the current version,
+    rendering and storing it on a miss.
+
+    Caching is disabled when TASKS_LIST_CACHE_TIMEOUT is 0.
+    """
+    timeout = getattr(settings, "TASKS_LIST_CACHE_TIMEOUT", 300)
+    if not timeout:
+        return render()
+
+    cache = get_cache()
+    # The version is read before rendering, so data written meanwhile can only
+    # be stored under an already outdated key.
+    key = _fragment_key(get_version(), key_parts)
+
+    html = cache.get(key)
+    if html is not None:
+        _record("hits")
+        return html
+
+    _record("misses")
+    html = render()
+    cache.set(key, html, timeout)
+    return html
+
+
+async def acached_fragment(key_parts, arender):
+    """Async counterpart of `cached_fragment`; `arender` is a coroutine function."""
+    timeout = getattr(settings, "TASKS_LIST_CACHE_TIMEOUT", 300)
+    if not timeout:
+        return await arender()
+
+    cache = get_cache()
+    key = _fragment_key(await aget_version(), key_parts)
+
+    html = await cache.aget(key)
+    if html is not None:
+        _record("hits")
+        return html
+
+    _record("misses")
+    html = await arender()
+    await cache.aset(key, html, timeout)
+    return html
+
+
+def cached_value(key_parts, compute):
+    """
+    Like `cached_fragment` for any picklable value, e.g. the task counts
+    shown next to the list; not counted in the fragment hit/miss stats.
+    """
+    timeout = getattr(settings, "TASKS_LIST_CACHE_TIMEOUT", 300)
+    if not timeout:
+        return compute()
+
+    cache = get_cache()
+    key = _fragment_key(get_version(), key_parts)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+async def acached_value(key_parts, acompute):
+    """Async counterpart of `cached_value`; `acompute` is a coroutine function."""
+    timeout = getattr(settings, "TASKS_LIST_CACHE_TIMEOUT", 300)
+    if not timeout:
+        return await acompute()
+
+    cache = get_cache()
+    key = _fragment_key(await aget_version(), key_parts)
+    value = await cache.aget(key)
+    if value is None:
+        value = await acompute()
+        await cache.aset(key, value, timeout)
+    return value
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    """Hit/miss counters of the fragment cache for this process."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats["hits"] = 0
+        _stats["misses"] = 0
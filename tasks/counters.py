@@ -0,0 +1,38 @@
+"""
+Open / done task counts read from the TaskCounter table.
+
+The counters are kept up to date by database triggers (migration 0007, put
+back after table rebuilds by tasks.triggers), so reading them is a two-row
+lookup whatever the number of tasks; `recount` repairs them from the Task
+table.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from tasks.models import Task, TaskCounter
+
+
+def _as_counts(rows):
+    rows = dict(rows)
+    return {"open": rows.get(False, 0), "done": rows.get(True, 0)}
+
+
+def task_counts():
+    """Return {"open": n, "done": m}."""
+    return _as_counts(TaskCounter.objects.values_list("complete", "count"))
+
+
+async def atask_counts():
+    """Async counterpart of `task_counts`, for async views."""
+    return _as_counts([row async for row in TaskCounter.objects.values_list("complete", "count")])
+
+
+def recount():
+    """Recompute the counters from the Task table; returns (stored, actual) counts."""
+    with transaction.atomic():
+        stored = _as_counts(TaskCounter.objects.select_for_update().values_list("complete", "count"))
+        actual = Task.objects.aggregate(open=Count("pk", filter=Q(complete=False)), done=Count("pk", filter=Q(complete=True)))
+        for complete, key in ((False, "open"), (True, "done")):
+            TaskCounter.objects.update_or_create(complete=complete, defaults={"count": actual[key]})
+    return stored, actual
@@ -0,0 +1,353 @@
+"""
+Incremental readers and writers for the task datasets handled by
+`import_dataset` and `export_dataset`.
+
+Two layouts are accepted:
+- a JSON array of objects (`[{"title": ..., "complete": ...}, ...]`)
+- NDJSON / JSON Lines, one object per line
+
+Both are parsed lazily so a dataset never has to fit in memory. Large
+datasets can also be cut into shards (whole files, or byte ranges of an
+NDJSON file) that are parsed and validated in a process pool; JSON array
+files, which cannot be cut, are streamed by the importing process instead.
+"""
+
+import csv
+import io
+import itertools
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+
+JSON = "json"
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (JSON, NDJSON)
+EXPORT_FORMATS = (JSON, NDJSON, CSV)
+EXPORT_FIELDS = ("title", "complete", "created")
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+_WHITESPACE = " \t\r\n\ufeff"
+_CHUNK_SIZE = 64 * 1024
+# Upper bound for one NDJSON byte-range shard, so a worker's result stays small.
+MAX_SHARD_BYTES = 16 * 1024 * 1024
+MIN_SHARD_BYTES = 1024 * 1024
+
+
+class Shard(NamedTuple):
+    """A unit of parsing work: a whole file, or the [start, end) byte range of an NDJSON file."""
+
+    path: str
+    fmt: str
+    start: int = 0
+    end: int = None
+
+
+def detect_format(path):
+    """
+    Guess the layout of `path` from its first significant character and suffix.
+
+    Raises ValueError when the file is neither a JSON array nor NDJSON.
+    """
+    with open(path, encoding="utf-8") as f:
+        first = ""
+        while True:
+            char = f.read(1)
+            if not char or char not in _WHITESPACE:
+                first = char
+                break
+
+    if first == "[":
+        return JSON
+    if first in ("{", "") and str(path).lower().endswith(NDJSON_SUFFIXES):
+        return NDJSON
+    raise ValueError("Dataset JSON must be a list of objects.")
+
+
+def iter_json_array(f, chunk_size=_CHUNK_SIZE):
+    """Yield the items of a top-level JSON array read from `f` chunk by chunk."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    skip_whitespace()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("Dataset JSON must be a list of objects.")
+    pos += 1
+
+    expect_item = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buf):
+            raise ValueError("Unexpected end of file in dataset JSON array.")
+        char = buf[pos]
+        if char == "]":
+            return
+        if char == ",":
+            if expect_item:
+                raise ValueError(f"Unexpected ',' in dataset JSON array near: {buf[pos:pos + 40]!r}")
+            pos += 1
+            expect_item = True
+            continue
+        if not expect_item:
+            raise ValueError(f"Expected ',' or ']' in dataset JSON array near: {buf[pos:pos + 40]!r}")
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise ValueError(f"Invalid dataset JSON: {exc}") from exc
+                fill()
+                continue
+            # A scalar cut at the chunk boundary (e.g. `12|3`) decodes "successfully".
+            if end == len(buf) and not eof:
+                fill()
+                continue
+            break
+
+        pos = end
+        expect_item = False
+        yield item
+
+
+def iter_ndjson(f):
+    """Yield one decoded object per non-blank line of `f`."""
+    for lineno, line in enumerate(f, start=1):
+        line = line.strip(_WHITESPACE)
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid NDJSON on line {lineno}: {exc}") from exc
+
+
+def iter_records(path, fmt=None):
+    """Yield the raw entries of the dataset at `path`, detecting its format if needed."""
+    fmt = fmt or detect_format(path)
+    with open(path, encoding="utf-8") as f:
+        if fmt == NDJSON:
+            yield from iter_ndjson(f)
+        else:
+            yield from iter_json_array(f)
+
+
+def clean_entry(entry):
+    """Return (title, complete) for a dataset entry, or None if it has no title."""
+    if not isinstance(entry, dict):
+        return None
+    title = entry.get("title")
+    if not title:
+        return None
+    return title, entry.get("complete", False)
+
+
+def split_ndjson(path, parts, max_shard_bytes=MAX_SHARD_BYTES, min_shard_bytes=MIN_SHARD_BYTES):
+    """
+    Cut the NDJSON file at `path` into byte-range shards aligned on line starts.
+
+    Aims for `parts` shards, each between `min_shard_bytes` and `max_shard_bytes`.
+    """
+    size = os.path.getsize(path)
+    shard_bytes = min(max_shard_bytes, max(min_shard_bytes, -(-size // max(parts, 1))))
+
+    shards = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + shard_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = min(f.tell(), size)
+            shards.append(Shard(str(path), NDJSON, start, end))
+            start = end
+    return shards
+
+
+def iter_shard(shard):
+    """
+    Parse and validate one shard, yielding (cleaned, entry) pairs in file order.
+
+    `cleaned` is the result of `clean_entry`; `entry` is only kept for
+    skipped entries.
+    """
+    if shard.end is None:
+        entries = iter_records(shard.path, shard.fmt)
+    else:
+        entries = _iter_ndjson_range(shard.path, shard.start, shard.end)
+
+    for entry in entries:
+        cleaned = clean_entry(entry)
+        yield cleaned, None if cleaned else entry
+
+
+def parse_shard(shard):
+    """
+    `iter_shard` as a list, for the process pool.
+
+    Only plain tuples are returned so results stay cheap to send between processes.
+    """
+    return list(iter_shard(shard))
+
+
+def _parsed_in_pool(shard):
+    # A whole JSON array would come back from a worker as one list the size
+    # of the file: it is streamed by the caller instead.
+    return shard.end is not None or shard.fmt == NDJSON
+
+
+def iter_parsed(shards, workers=1):
+    """
+    Yield (cleaned, entry) pairs for every shard, in shard order.
+
+    With several workers, NDJSON shards are parsed in a process pool while the
+    caller consumes results; at most `2 * workers` shards are in flight at
+    once. JSON array files are streamed in this process, in their turn, while
+    the pool works on the shards queued after them.
+    """
+    # A daemonic process (e.g. a worker of `manage.py test --parallel`) may not
+    # have children: parse in-process.
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        for shard in shards:
+            yield from iter_shard(shard)
+        return
+
+    shards = iter(shards)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def fill():
+            while len(pending) < 2 * workers:
+                shard = next(shards, None)
+                if shard is None:
+                    return
+                pending.append(pool.submit(parse_shard, shard) if _parsed_in_pool(shard) else shard)
+
+        fill()
+        while pending:
+            item = pending.popleft()
+            fill()
+            if isinstance(item, Shard):
+                yield from iter_shard(item)
+            else:
+                yield from item.result()
+
+
+def _iter_ndjson_range(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            line = line.decode("utf-8").strip(_WHITESPACE)
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid NDJSON at byte {offset} of {path}: {exc}") from exc
+
+
+class _ExportWriter:
+    """Serializes exported rows as `fmt` into a buffer drained chunk by chunk."""
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        self.buf = io.StringIO()
+        self.writer = csv.writer(self.buf) if fmt == CSV else None
+        self.count = 0
+        if fmt == JSON:
+            self.buf.write("[")
+        elif fmt == CSV:
+            self.writer.writerow(EXPORT_FIELDS)
+
+    def write(self, row):
+        title, complete, created = row
+        if self.fmt == CSV:
+            self.writer.writerow((title, complete, created.isoformat()))
+        else:
+            line = json.dumps({"title": title, "complete": complete, "created": created.isoformat()}, ensure_ascii=False)
+            if self.fmt == JSON:
+                self.buf.write(",\n" if self.count else "\n")
+                self.buf.write(line)
+            else:
+                self.buf.write(line + "\n")
+        self.count += 1
+
+    def drain(self):
+        chunk = self.buf.getvalue()
+        self.buf.seek(0)
+        self.buf.truncate()
+        return chunk
+
+    def close(self):
+        if self.fmt == JSON:
+            self.buf.write("\n]\n" if self.count else "]\n")
+        return self.drain()
+
+
+def _export_rows(queryset):
+    return queryset.order_by("created", "id").values_list(*EXPORT_FIELDS)
+
+
+def iter_export(queryset, fmt, chunk_size=2000):
+    """
+    Yield `queryset` serialized as `fmt`, in text chunks of about `chunk_size` tasks.
+
+    Rows are read with a chunked iterator ordered by (created, id), so memory
+    use does not depend on the number of tasks.
+    """
+    writer = _ExportWriter(fmt)
+    for row in _export_rows(queryset).iterator(chunk_size=chunk_size):
+        writer.write(row)
+        if writer.count % chunk_size == 0:
+            yield writer.drain()
+    tail = writer.close()
+    if tail:
+        yield tail
+
+
+async def aiter_export(queryset, fmt, chunk_size=2000):
+    """
+    Async counterpart of `iter_export`, for responses streamed under ASGI:
+    Django would otherwise read a sync iterator to the end before sending
+    the first chunk.
+    """
+    # QuerySet.aiterator() runs values_list() queries in the event loop, so
+    # the sync iterator is advanced a chunk at a time in a worker thread.
+    rows = _export_rows(queryset).iterator(chunk_size=chunk_size)
+    take = sync_to_async(lambda: list(itertools.islice(rows, chunk_size)))
+    writer = _ExportWriter(fmt)
+    while chunk := await take():
+        for row in chunk:
+            writer.write(row)
+        yield writer.drain()
+    tail = writer.close()
+    if tail:
+        yield tail
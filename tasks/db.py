@@ -0,0 +1,54 @@
+"""
+SQLite tuning and write-contention handling.
+
+`configure_sqlite` runs on every new connection (connection_created signal) and
+applies the PRAGMAs listed in the SQLITE_PRAGMAS setting. `retry_on_locked`
+retries a write that failed with "database is locked" with exponential backoff.
+"""
+
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def is_locked_error(exc):
+    message = str(exc).lower()
+    return isinstance(exc, OperationalError) and ("database is locked" in message or "database is busy" in message)
+
+
+def retry_on_locked(func):
+    """
+    Retry `func` when SQLite reports the database as locked.
+
+    Up to SQLITE_LOCK_RETRIES retries are made, sleeping SQLITE_LOCK_BACKOFF
+    seconds doubled on each attempt (with jitter). Nothing is retried inside an
+    outer atomic block, since that transaction is already broken.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        retries = getattr(settings, "SQLITE_LOCK_RETRIES", 5)
+        delay = getattr(settings, "SQLITE_LOCK_BACKOFF", 0.05)
+        for attempt in range(retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if attempt == retries or not is_locked_error(exc) or transaction.get_connection().in_atomic_block:
+                    raise
+                time.sleep(delay * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    return wrapper
@@ -0,0 +1,124 @@
+"""
+Fan-out of task change events to Server-Sent Events subscribers.
+
+Writers publish events from any thread (signal handlers, bulk paths); each
+connected SSE client owns a bounded asyncio queue fed by the broker. The
+broker class is set by TASKS_EVENT_BROKER, so the in-process default can be
+replaced by one spanning several workers (e.g. Redis pub/sub) implementing
+the same `publish` / `subscribe` / `unsubscribe` interface. Nothing is
+rendered or published while a broker reports no subscribers, which is always
+the case under WSGI where /events/ is not served.
+"""
+
+import abc
+import asyncio
+import itertools
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class EventBroker(abc.ABC):
+    """Interface of the task event brokers."""
+
+    @abc.abstractmethod
+    def publish(self, event):
+        """Deliver `event` (a JSON-serializable dict) to every subscriber. Thread-safe."""
+
+    @abc.abstractmethod
+    def subscribe(self):
+        """Return a new subscription: an asyncio.Queue bound to the running loop."""
+
+    @abc.abstractmethod
+    def unsubscribe(self, queue):
+        """Stop feeding a queue returned by `subscribe`."""
+
+    def has_subscribers(self):
+        """Whether publishing may reach anyone; brokers that cannot tell keep the default."""
+        return True
+
+
+class InProcessBroker(EventBroker):
+    """Broker local to one process: events reach the SSE clients connected to this worker."""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def publish(self, event):
+        event = {"seq": next(self._ids), **event}
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(self._deliver, queue, event)
+
+    @staticmethod
+    def _deliver(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client that cannot keep up is told to reload instead.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"seq": event["seq"], "type": "refresh"})
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def has_subscribers(self):
+        return self.subscriber_count > 0
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            path = getattr(settings, "TASKS_EVENT_BROKER", "tasks.events.InProcessBroker")
+            _broker = import_string(path)()
+        return _broker
+
+
+def reset_broker():
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+def publish_task_event(kind, task=None, pk=None):
+    """Publish a created/updated/deleted event for one task."""
+    from django.template.loader import render_to_string
+
+    broker = get_broker()
+    if not broker.has_subscribers():
+        return
+    event = {"type": kind, "id": task.pk if task is not None else pk}
+    if task is not None and kind != "deleted":
+        event["complete"] = task.complete
+        event["html"] = render_to_string('tasks/task_row.html', {'task': task, 'status': 'all'})
+    broker.publish(event)
+
+
+def publish_refresh():
+    """Tell clients to reload after a bulk change that has no per-task events."""
+    broker = get_broker()
+    if broker.has_subscribers():
+        broker.publish({"type": "refresh"})
@@ -0,0 +1,66 @@
+from datetime import datetime, time
+from urllib.parse import urlencode
+
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+# ?status= values accepted by the task list, mapped to queryset filters.
+STATUS_FILTERS = {
+    "all": {},
+    "open": {"complete": False},
+    "done": {"complete": True},
+}
+DEFAULT_STATUS = "all"
+# Largest id of a BigAutoField; bigger values overflow the database integer.
+MAX_ID = 2 ** 63 - 1
+
+
+def get_status(params):
+    """Return the status filter requested in `params`, falling back to the default."""
+    status = params.get("status", DEFAULT_STATUS)
+    return status if status in STATUS_FILTERS else DEFAULT_STATUS
+
+
+def filter_by_status(queryset, status):
+    return queryset.filter(**STATUS_FILTERS[status])
+
+
+def list_url(status, query=""):
+    """URL of the home list keeping the current status filter (and search, if any)."""
+    params = {}
+    if status != DEFAULT_STATUS:
+        params["status"] = status
+    if query:
+        params["q"] = query
+    url = reverse("list")
+    return f"{url}?{urlencode(params)}" if params else url
+
+
+def parse_id(value):
+    """Return the task id given as text in a request, or None if it is not a valid one."""
+    try:
+        pk = int(value)
+    except (TypeError, ValueError):
+        return None
+    return pk if 0 < pk <= MAX_ID else None
+
+
+def parse_since(value):
+    """
+    Parse an ISO date or datetime used as a lower bound on `created`.
+
+    Naive values are taken in the current time zone. Returns None for an empty
+    value and raises ValueError when it cannot be parsed.
+    """
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value!r}")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
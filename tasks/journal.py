@@ -0,0 +1,167 @@
+"""
+Change journal behind the /sync endpoint.
+
+Every Task write appends TaskChange rows in its own transaction: single
+saves and deletes through tasks.signals, bulk writes (bulk actions, API
+batches, import_dataset) by calling `record` next to their bulk query.
+Clients keep the id of the last change they applied as their cursor and
+fetch only what changed after it. That needs ids to become visible in
+increasing order, which concurrent transactions do not guarantee on
+PostgreSQL: journal writes are therefore serialized by a transaction-level
+advisory lock (SQLite serializes every write anyway).
+
+`compact` keeps the journal bounded: it drops every entry superseded by a
+newer one for the same task, then the tombstones older than the retention
+period. Cursors older than the newest dropped tombstone can no longer be
+served incrementally (see `horizon`).
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from tasks.models import Task, TaskChange
+
+
+class CursorExpired(Exception):
+    """The cursor predates compacted tombstones; the client must sync from scratch."""
+
+
+_local = threading.local()
+
+# Key of the PostgreSQL advisory lock serializing journal writes.
+JOURNAL_LOCK_KEY = 0x7461736B
+
+
+def _lock_journal(connection):
+    """
+    Hold the journal write lock until the current transaction ends, so
+    entries commit in id order and a cursor never skips a late-committing one.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [JOURNAL_LOCK_KEY])
+
+
+def _insert(entries):
+    with transaction.atomic(savepoint=False):
+        _lock_journal(connections[TaskChange.objects.db])
+        TaskChange.objects.bulk_create(entries)
+
+
+def record(action, pks):
+    """Append one `action` entry per task id, in the caller's transaction."""
+    now = timezone.now()
+    entries = [TaskChange(task_id=pk, action=action, at=now) for pk in pks]
+    pending = getattr(_local, "pending", None)
+    if pending is not None:
+        pending.extend(entries)
+    elif entries:
+        _insert(entries)
+
+
+def record_queryset(action, queryset):
+    """
+    Append one `action` entry per task of `queryset` with a single
+    INSERT ... SELECT, without loading the tasks; returns the number of entries.
+    """
+    select, params = queryset.values_list("id").query.sql_with_params()
+    connection = connections[queryset.db]
+    at = TaskChange._meta.get_field("at").get_db_prep_value(timezone.now(), connection)
+    with transaction.atomic(using=queryset.db, savepoint=False), connection.cursor() as cursor:
+        _lock_journal(connection)
+        cursor.execute(
+            f"INSERT INTO {TaskChange._meta.db_table} (task_id, action, at) "
+            f"SELECT id, %s, %s FROM ({select}) tasks",
+            [action, at, *params],
+        )
+        return cursor.rowcount
+
+
+@contextmanager
+def batched():
+    """
+    Write the entries recorded inside the block in one query when it exits.
+
+    Used around bulk writes whose per-row signals would otherwise insert one
+    entry each; the block must sit inside the write's transaction.
+    """
+    if getattr(_local, "pending", None) is not None:
+        yield
+        return
+    _local.pending = []
+    try:
+        yield
+        entries = _local.pending
+    finally:
+        _local.pending = None
+    if entries:
+        _insert(entries)
+
+
+def horizon():
+    """Oldest cursor that can still be synced incrementally."""
+    return (
+        TaskChange.objects.filter(action=TaskChange.COMPACTED).aggregate(last=Max("id"))["last"] or 0
+    )
+
+
+def changes_since(cursor, limit):
+    """
+    Return (changes, next_cursor, has_more) for up to `limit` journal entries after `cursor`.
+
+    Entries of the same task within the page are folded into its latest state:
+    the current task for creates and updates, a tombstone for deletes (or if
+    the task has since been deleted).
+    """
+    if cursor < horizon():
+        raise CursorExpired(cursor)
+
+    entries = list(
+        TaskChange.objects.filter(id__gt=cursor)
+        .exclude(action=TaskChange.COMPACTED)
+        .order_by("id")
+        .values_list("id", "task_id", "action")[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return [], cursor, False
+
+    latest = {}
+    for _, task_id, action in entries:
+        latest.pop(task_id, None)
+        latest[task_id] = action
+    live = [task_id for task_id, action in latest.items() if action != TaskChange.DELETED]
+    tasks = Task.objects.in_bulk(live)
+
+    changes = []
+    for task_id in latest:
+        task = tasks.get(task_id)
+        if task is None:
+            changes.append({"id": task_id, "deleted": True})
+        else:
+            changes.append({"id": task_id, "deleted": False, "task": task})
+    return changes, entries[-1][0], has_more
+
+
+def compact(retention):
+    """Drop superseded entries and expired tombstones; returns the number of rows deleted."""
+    latest = TaskChange.objects.values("task_id").annotate(last=Max("id")).values("last")
+    superseded, _ = (
+        TaskChange.objects.exclude(id__in=latest).exclude(action=TaskChange.COMPACTED).delete()
+    )
+
+    expired = TaskChange.objects.filter(action=TaskChange.DELETED, at__lt=timezone.now() - retention)
+    newest = expired.aggregate(last=Max("id"))["last"]
+    dropped = 0
+    if newest is not None:
+        # The newest expired tombstone becomes the horizon marker; older markers go.
+        TaskChange.objects.filter(id=newest).update(action=TaskChange.COMPACTED)
+        dropped, _ = expired.delete()
+        markers, _ = TaskChange.objects.filter(action=TaskChange.COMPACTED, id__lt=newest).delete()
+        dropped += markers
+    return superseded + dropped
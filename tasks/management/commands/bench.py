@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from tasks import bench
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the task views (liste, recherche, création, mise à jour, suppression) "
+        "on a throwaway database and report latency, throughput and query counts as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10000, help="Nombre de tâches générées (par défaut: 10000).")
+        parser.add_argument("--requests", type=int, default=200, help="Requêtes par scénario (par défaut: 200).")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=bench.SCENARIOS,
+            help="Ne lance que ce scénario (répétable, par défaut: tous).",
+        )
+        parser.add_argument(
+            "--http",
+            action="store_true",
+            help="Mesure aussi en HTTP réel, avec des clients concurrents sur un serveur local.",
+        )
+        parser.add_argument("--concurrency", type=int, default=8, help="Clients HTTP concurrents (par défaut: 8).")
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Désactive le cache des fragments de liste (TASKS_LIST_CACHE_TIMEOUT=0).",
+        )
+        parser.add_argument(
+            "--output",
+            default="result_bench.json",
+            help="Fichier du rapport JSON (par défaut: result_bench.json, '-' pour la sortie standard).",
+        )
+        parser.add_argument("--baseline", help="Rapport de référence : échoue si les résultats régressent.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=bench.DEFAULT_TOLERANCE,
+            help="Dégradation de latence / débit tolérée, en fraction (par défaut: 0.25).",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Enregistre ce rapport comme référence dans le fichier de --baseline.",
+        )
+
+    def handle(self, *args, **options):
+        if options["tasks"] < 0 or options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--tasks must be >= 0, --requests and --concurrency >= 1.")
+        if options["save_baseline"] and not options["baseline"]:
+            raise CommandError("--save-baseline needs --baseline.")
+        baseline = None
+        if options["baseline"] and not options["save_baseline"]:
+            if not os.path.exists(options["baseline"]):
+                raise CommandError(f"Baseline not found: {options['baseline']}")
+            baseline = bench.load_report(options["baseline"])
+
+        overrides = {"ALLOWED_HOSTS": ["*"], "DEBUG": False}
+        if options["no_cache"]:
+            overrides["TASKS_LIST_CACHE_TIMEOUT"] = 0
+        with tempfile.TemporaryDirectory() as tmp, override_settings(**overrides):
+            results = self._run_isolated(tmp, options)
+
+        report = {
+            "tasks": options["tasks"],
+            "cache": not options["no_cache"],
+            "database": connection.vendor,
+            "benchmarks": results,
+        }
+        regressions = bench.compare(results, baseline, options["tolerance"]) if baseline else []
+
+        if options["output"] == "-":
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            bench.write_report(options["output"], report)
+            for result in results:
+                self.stdout.write(
+                    f"{result['bench_id']:<18} p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  "
+                    f"p99 {result['p99_ms']:>8} ms  {result['throughput_rps']:>8} req/s  "
+                    f"queries {result['queries_per_request'] if result['queries_per_request'] is not None else '-'}  "
+                    f"cache hits {result['cache_hit_ratio']:.0%}"
+                )
+        if options["save_baseline"]:
+            bench.write_report(options["baseline"], report)
+            self.stdout.write(f"Baseline saved to {options['baseline']}.")
+
+        if regressions:
+            raise CommandError("Benchmark regressed:\n  " + "\n  ".join(regressions))
+        if baseline:
+            self.stdout.write(self.style.SUCCESS("No regression against the baseline."))
+
+    def _run_isolated(self, tmp, options):
+        """Seed and benchmark a fresh test database (a temporary file on SQLite)."""
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        if connection.vendor == "sqlite":
+            connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(tmp, "bench.sqlite3")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            bench.seed(options["tasks"])
+            results = self._run_mode("client", options)
+            if options["http"]:
+                with bench.LocalServer() as server:
+                    results += self._run_mode("http", options, server)
+            return results
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _run_mode(self, mode, options, server=None):
+        scenarios = bench.build_scenarios(options["requests"])
+        if options["scenarios"]:
+            scenarios = [scenario for scenario in scenarios if scenario.name in options["scenarios"]]
+
+        results = []
+        for scenario in scenarios:
+            if mode == "http":
+                results.append(bench.run_http(scenario, options["requests"], options["concurrency"], server))
+            else:
+                results.append(bench.run_client(scenario, options["requests"]))
+        return results
@@ -0,0 +1,36 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tasks import journal
+from tasks.db import retry_on_locked
+from tasks.models import TaskChange
+
+
+class Command(BaseCommand):
+    help = "Compact the task change journal used by /sync (à lancer périodiquement, par exemple via cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "TASKS_JOURNAL_RETENTION_DAYS", 30),
+            help="Durée de conservation des suppressions, en jours (par défaut: TASKS_JOURNAL_RETENTION_DAYS).",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must be zero or a positive integer.")
+
+        deleted = self._compact(datetime.timedelta(days=options["days"]))
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {deleted} journal entr{'y' if deleted == 1 else 'ies'}, "
+            f"{TaskChange.objects.count()} left."
+        ))
+
+    @retry_on_locked
+    def _compact(self, retention):
+        with transaction.atomic():
+            return journal.compact(retention)
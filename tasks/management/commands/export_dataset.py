@@ -0,0 +1,96 @@
+import gzip
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.dataset import EXPORT_FORMATS, iter_export
+from tasks.filters import STATUS_FILTERS, filter_by_status, parse_since
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = "Export tasks to a JSON, NDJSON or CSV dataset file (JSON et NDJSON sont relisibles par import_dataset, CSV non)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            type=str,
+            default="-",
+            help="Fichier de sortie (par défaut: sortie standard). Un suffixe .gz active la compression.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=("auto",) + EXPORT_FORMATS,
+            default="auto",
+            help="Format de sortie (par défaut: déduit de l'extension, sinon JSON).",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compresse la sortie avec gzip.",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="N'exporte que les tâches créées à partir de cette date (ISO 8601).",
+        )
+        parser.add_argument(
+            "--status",
+            choices=tuple(STATUS_FILTERS),
+            default="all",
+            help="N'exporte que les tâches ouvertes (open), terminées (done) ou toutes (all).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Nombre de tâches lues par aller-retour en base (par défaut: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        use_gzip = options["gzip"] or path.endswith(".gz")
+        fmt = options["format"]
+        if fmt == "auto":
+            fmt = self._format_from_path(path)
+
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+        try:
+            since = parse_since(options["since"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        queryset = filter_by_status(Task.objects.all(), options["status"])
+        if since is not None:
+            queryset = queryset.filter(created__gte=since)
+
+        started = time.monotonic()
+        chunks = iter_export(queryset, fmt, chunk_size=options["chunk_size"])
+
+        if path == "-":
+            if use_gzip:
+                with gzip.open(sys.stdout.buffer, "wt", encoding="utf-8") as out:
+                    out.writelines(chunks)
+            else:
+                for chunk in chunks:
+                    self.stdout.write(chunk, ending="")
+            return
+
+        opener = gzip.open if use_gzip else open
+        with opener(path, "wt", encoding="utf-8", newline="") as out:
+            out.writelines(chunks)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported tasks to {path} ({fmt}{', gzip' if use_gzip else ''}, {time.monotonic() - started:.1f}s)"
+        ))
+
+    @staticmethod
+    def _format_from_path(path):
+        suffixes = [suffix.lower() for suffix in Path(path).suffixes if suffix.lower() != ".gz"]
+        suffix = suffixes[-1].lstrip(".") if suffixes else ""
+        if suffix == "jsonl":
+            return "ndjson"
+        return suffix if suffix in EXPORT_FORMATS else "json"
@@ -1,15 +1,27 @@
-import json
+import glob
+import time
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
-from tasks.models import Task
+from tasks import journal
+from tasks.cache import bump_version
+from tasks.dataset import FORMATS, NDJSON, Shard, detect_format, iter_parsed, split_ndjson
+from tasks.db import retry_on_locked
+from tasks.events import publish_refresh
+from tasks.models import Task, TaskChange
 
 
 class Command(BaseCommand):
     help = "Import tasks from a JSON dataset file (dataset.json par défaut)."
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Fichiers ou motifs glob à importer (remplacent --path).",
+        )
         parser.add_argument(
             "--path",
             type=str,
@@ -19,41 +31,157 @@ class Command(BaseCommand):
         parser.add_argument(
             "--truncate",
             action="store_true",
-            help="Supprime toutes les tâches existantes avant import.",
+            help="Supprime toutes les tâches existantes avant import (après avoir vérifié tout le fichier).",
+        )
+        parser.add_argument(
+            "--format",
+            choices=("auto",) + FORMATS,
+            default="auto",
+            help="Format du fichier : tableau JSON ou NDJSON (par défaut: détection automatique).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Nombre de tâches insérées par transaction (par défaut: 1000).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Nombre de processus d'analyse en parallèle (par défaut: 1).",
         )
 
     def handle(self, *args, **options):
-        path = Path(options["path"])
-
-        if not path.exists():
-            raise CommandError(f"Dataset file not found: {path}")
+        paths = self._resolve_paths(options["paths"] or [options["path"]])
+        batch_size = options["batch_size"]
+        workers = options["workers"]
 
-        self.stdout.write(f"Loading dataset from {path} ...")
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        if workers < 1:
+            raise CommandError("--workers must be a positive integer.")
 
-        with path.open(encoding="utf-8") as f:
-            data = json.load(f)
+        source = paths[0] if len(paths) == 1 else f"{len(paths)} files"
+        self.stdout.write(f"Loading dataset from {source} ...")
 
-        if not isinstance(data, list):
-            raise CommandError("Dataset JSON must be a list of objects.")
+        try:
+            shards = self._build_shards(paths, options["format"], workers)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
 
+        deleted = 0
         if options["truncate"]:
-            deleted, _ = Task.objects.all().delete()
+            # A dataset that turns out malformed must not leave the table empty:
+            # parse it all once before deleting anything.
+            try:
+                self._validate(shards, workers)
+            except ValueError as exc:
+                raise CommandError(str(exc)) from exc
+            deleted = self._truncate()
             self.stdout.write(f"Deleted {deleted} existing task(s).")
 
+        self._started = time.monotonic()
+        self._last_report = self._started
         created = 0
-        for entry in data:
-            title = entry.get("title")
-            complete = entry.get("complete", False)
-
-            if not title:
-                self.stderr.write(
-                    self.style.WARNING(f"Skipping entry without title: {entry!r}")
-                )
-                continue
+        skipped = 0
+        batch = []
+
+        try:
+            for cleaned, entry in iter_parsed(shards, workers):
+                if cleaned is None:
+                    self.stderr.write(
+                        self.style.WARNING(f"Skipping entry without title: {entry!r}")
+                    )
+                    skipped += 1
+                    continue
 
-            Task.objects.create(title=title, complete=complete)
-            created += 1
+                title, complete = cleaned
+                batch.append(Task(title=title, complete=complete))
+                if len(batch) >= batch_size:
+                    created += self._write_batch(batch)
+                    batch = []
+                    self._report_progress(created)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
 
+        created += self._write_batch(batch)
+        if created or deleted:
+            # Only reaches other processes with a cross-process TASKS_EVENT_BROKER.
+            publish_refresh()
+
+        elapsed = time.monotonic() - self._started
         self.stdout.write(self.style.SUCCESS(
-            f"Imported {created} task(s) from {path}"
+            f"Imported {created} task(s) from {source} "
+            f"(skipped {skipped}, {elapsed:.1f}s, {self._rate(created, elapsed):.0f} rows/s)"
         ))
+
+    def _resolve_paths(self, patterns):
+        paths = []
+        for pattern in patterns:
+            if any(char in pattern for char in "*?["):
+                matches = sorted(glob.glob(pattern))
+                if not matches:
+                    raise CommandError(f"No dataset file matches: {pattern}")
+                paths.extend(Path(match) for match in matches)
+                continue
+            path = Path(pattern)
+            if not path.exists():
+                raise CommandError(f"Dataset file not found: {path}")
+            paths.append(path)
+        return paths
+
+    def _build_shards(self, paths, fmt_option, workers):
+        """One shard per file, NDJSON files being cut into byte ranges when running in parallel."""
+        shards = []
+        for path in paths:
+            fmt = detect_format(path) if fmt_option == "auto" else fmt_option
+            if fmt == NDJSON and workers > 1:
+                shards.extend(split_ndjson(path, workers * 4))
+            else:
+                shards.append(Shard(str(path), fmt))
+        return shards
+
+    @staticmethod
+    def _validate(shards, workers):
+        """Parse every shard without keeping the entries; raises ValueError like the import."""
+        for _ in iter_parsed(shards, workers):
+            pass
+
+    @retry_on_locked
+    def _truncate(self):
+        # A raw DELETE: QuerySet.delete() would load every task to send its
+        # post_delete signal (cache bump, journal entry, event) one by one.
+        with transaction.atomic():
+            tasks = Task.objects.all()
+            journal.record_queryset(TaskChange.DELETED, tasks)
+            deleted = tasks._raw_delete(tasks.db)
+            bump_version()
+            transaction.on_commit(bump_version)
+        return deleted
+
+    def _write_batch(self, batch):
+        if not batch:
+            return 0
+        self._insert_batch(batch)
+        # bulk_create sends no post_save signal.
+        bump_version()
+        return len(batch)
+
+    @retry_on_locked
+    def _insert_batch(self, batch):
+        with transaction.atomic():
+            created = Task.objects.bulk_create(batch)
+            journal.record(TaskChange.CREATED, [task.pk for task in created])
+
+    def _report_progress(self, created):
+        now = time.monotonic()
+        if now - self._last_report < 1.0:
+            return
+        self._last_report = now
+        elapsed = now - self._started
+        self.stdout.write(f"  {created} task(s) imported ({self._rate(created, elapsed):.0f} rows/s)")
+
+    @staticmethod
+    def _rate(count, elapsed):
+        return count / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.counters import recount, task_counts
+from tasks.db import retry_on_locked
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = "Rebuild the open/done task counters from the Task table (réparation après une écriture hors triggers)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Vérifie seulement les compteurs, sans les corriger (code de sortie non nul s'ils divergent).",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            stored = task_counts()
+            actual = {"open": Task.objects.filter(complete=False).count(), "done": Task.objects.filter(complete=True).count()}
+            if stored != actual:
+                raise CommandError(f"Counters out of sync: stored {self._format(stored)}, actual {self._format(actual)}.")
+            self.stdout.write(self.style.SUCCESS(f"Counters OK: {self._format(stored)}."))
+            return
+
+        stored, actual = retry_on_locked(recount)()
+        if stored == actual:
+            self.stdout.write(self.style.SUCCESS(f"Counters already correct: {self._format(actual)}."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Counters fixed: {self._format(stored)} -> {self._format(actual)}."))
+
+    @staticmethod
+    def _format(counts):
+        return f"{counts['open']} open / {counts['done']} done"
@@ -0,0 +1,76 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import server
+
+
+class Command(BaseCommand):
+    help = (
+        "Production server (gunicorn): load the application once, then fork the workers "
+        "(WSGI or ASGI) which share it. TERM stops gracefully, HUP replaces the workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bind", default="127.0.0.1:8000", help="Adresse d'écoute host:port (par défaut: 127.0.0.1:8000).")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=server.default_workers(),
+            help="Nombre de workers (par défaut: le nombre de processeurs).",
+        )
+        parser.add_argument(
+            "--interface",
+            choices=server.INTERFACES,
+            default="wsgi",
+            help="Interface de l'application : wsgi (todo.wsgi) ou asgi (todo.asgi, pour /events). Par défaut: wsgi.",
+        )
+        parser.add_argument(
+            "--max-requests",
+            type=int,
+            default=0,
+            help="Remplace un worker après ce nombre de requêtes (par défaut: 0, jamais).",
+        )
+        parser.add_argument(
+            "--max-requests-jitter",
+            type=int,
+            default=0,
+            help="Ajoute au plus ce nombre aléatoire à --max-requests, pour étaler les remplacements.",
+        )
+        parser.add_argument(
+            "--graceful-timeout",
+            type=int,
+            default=30,
+            help="Secondes laissées aux requêtes en cours à l'arrêt ou au redémarrage d'un worker (par défaut: 30).",
+        )
+
+    def handle(self, *args, **options):
+        if not hasattr(os, "fork"):
+            raise CommandError("serve needs os.fork(), which this platform does not provide.")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be >= 1.")
+        if options["max_requests"] < 0 or options["max_requests_jitter"] < 0 or options["graceful_timeout"] < 0:
+            raise CommandError("--max-requests, --max-requests-jitter and --graceful-timeout must be >= 0.")
+        try:
+            host, port = server.parse_bind(options["bind"])
+        except ValueError as e:
+            raise CommandError(str(e)) from None
+        try:
+            import gunicorn  # noqa: F401
+        except ImportError:
+            raise CommandError("serve needs gunicorn (and uvicorn-worker for --interface asgi).") from None
+        if options["workers"] > 1 and server.uses_local_memory_cache():
+            raise CommandError(
+                "--workers > 1 needs a cache shared between processes: with the local-memory cache, "
+                "each worker would serve stale task lists (see tasks.cache)."
+            )
+
+        application = server.load_application(options["interface"])
+        server.run(application, server.gunicorn_options(
+            options["interface"],
+            f"[{host}]:{port}" if ":" in host else f"{host}:{port}",
+            options["workers"],
+            max_requests=options["max_requests"],
+            max_requests_jitter=options["max_requests_jitter"],
+            graceful_timeout=options["graceful_timeout"],
+        ))
@@ -0,0 +1,207 @@
+"""
+In-process request metrics, exposed in Prometheus text format on /metrics.
+
+tasks.middleware.MetricsMiddleware records, per URL name and method: a
+latency histogram, the status codes, the database queries (count and time)
+and the response bytes. The hit / miss counters of the task-list cache
+(tasks.cache) are exported too. Everything is kept in memory, per process:
+with several worker processes each scrape sees the worker that answered it.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from tasks.cache import cache_stats
+
+# Upper bounds, in seconds, of the latency histogram buckets (+Inf is implicit).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_active_counter = ContextVar("tasks_query_counter", default=None)
+
+
+class _RequestSeries:
+    __slots__ = ("buckets", "count", "seconds", "queries", "query_seconds", "response_bytes")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """Thread-safe store of the request metrics of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._statuses = {}
+        self._profiled = {}
+        self._templates = {}
+
+    def observe_request(self, view, method, status, seconds, queries=0, query_seconds=0.0, response_bytes=0):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            series = self._series.get((view, method))
+            if series is None:
+                series = self._series[(view, method)] = _RequestSeries()
+            series.buckets[bucket] += 1
+            series.count += 1
+            series.seconds += seconds
+            series.queries += queries
+            series.query_seconds += query_seconds
+            series.response_bytes += response_bytes
+            key = (view, method, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def observe_templates(self, view, timings):
+        """Add the (kind, name) -> [count, seconds] timings of one profiled request."""
+        with self._lock:
+            self._profiled[view] = self._profiled.get(view, 0) + 1
+            for key, (count, seconds) in timings.items():
+                entry = self._templates.get(key)
+                if entry is None:
+                    self._templates[key] = [count, seconds]
+                else:
+                    entry[0] += count
+                    entry[1] += seconds
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._statuses.clear()
+            self._profiled.clear()
+            self._templates.clear()
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            series = sorted((key, _copy(value)) for key, value in self._series.items())
+            statuses = sorted(self._statuses.items())
+            profiled = sorted(self._profiled.items())
+            templates = sorted((key, tuple(value)) for key, value in self._templates.items())
+
+        lines = [
+            "# HELP todo_http_request_duration_seconds Time spent answering requests, per URL name.",
+            "# TYPE todo_http_request_duration_seconds histogram",
+        ]
+        for (view, method), values in series:
+            labels = f'view="{_escape(view)}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), values.buckets, strict=True):
+                cumulative += count
+                lines.append(f'todo_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"todo_http_request_duration_seconds_sum{{{labels}}} {values.seconds:.6f}")
+            lines.append(f"todo_http_request_duration_seconds_count{{{labels}}} {values.count}")
+
+        lines += [
+            "# HELP todo_http_requests_total Requests answered, per URL name and status code.",
+            "# TYPE todo_http_requests_total counter",
+        ]
+        for (view, method, status), count in statuses:
+            lines.append(f'todo_http_requests_total{{view="{_escape(view)}",method="{method}",status="{status}"}} {count}')
+
+        for name, attribute, help_text in (
+            ("todo_db_queries_total", "queries", "Database queries run by requests."),
+            ("todo_db_query_duration_seconds_total", "query_seconds", "Time spent in database queries by requests."),
+            ("todo_http_response_size_bytes_total", "response_bytes", "Response body bytes (streamed bodies excluded)."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (view, method), values in series:
+                value = getattr(values, attribute)
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'{name}{{view="{_escape(view)}",method="{method}"}} {value}')
+
+        if profiled:
+            lines += [
+                "# HELP todo_template_profiled_requests_total Requests sampled for template render timing.",
+                "# TYPE todo_template_profiled_requests_total counter",
+            ]
+            lines += [f'todo_template_profiled_requests_total{{view="{_escape(view)}"}} {count}' for view, count in profiled]
+            lines += [
+                "# HELP todo_template_renders_total Templates, include tags and url tags rendered by sampled requests.",
+                "# TYPE todo_template_renders_total counter",
+            ]
+            lines += [
+                f'todo_template_renders_total{{kind="{kind}",name="{_escape(name)}"}} {count}'
+                for (kind, name), (count, _) in templates
+            ]
+            lines += [
+                "# HELP todo_template_render_seconds_total Inclusive render time in sampled requests.",
+                "# TYPE todo_template_render_seconds_total counter",
+            ]
+            lines += [
+                f'todo_template_render_seconds_total{{kind="{kind}",name="{_escape(name)}"}} {seconds:.6f}'
+                for (kind, name), (_, seconds) in templates
+            ]
+
+        stats = cache_stats()
+        for outcome, help_text in (
+            ("hits", "Task-list fragment and count lookups served from the cache."),
+            ("misses", "Task-list fragment and count lookups rendered or queried again."),
+        ):
+            name = f"todo_list_cache_{outcome}_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {stats[outcome]}"]
+        return "\n".join(lines) + "\n"
+
+
+def _copy(series):
+    copy = _RequestSeries()
+    for attribute in _RequestSeries.__slots__:
+        value = getattr(series, attribute)
+        setattr(copy, attribute, list(value) if isinstance(value, list) else value)
+    return copy
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def count_queries(execute, sql, params, many, context):
+    """Execute wrapper adding each query, and its time, to the active QueryCounter."""
+    counter = _active_counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        counter.count += 1
+        counter.seconds += time.perf_counter() - started
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """Install count_queries on every new connection (connection_created signal)."""
+    if count_queries not in connection.execute_wrappers:
+        # Outermost, and below any execute_wrapper() block that is already open.
+        connection.execute_wrappers.insert(0, count_queries)
+
+
+class QueryCounter:
+    """
+    Counts the queries, and their time, run while entered.
+
+    Connections are per thread, so the counter travels in a context variable:
+    queries made from sync_to_async threads on behalf of an async request are
+    counted too.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self._token = None
+
+    def __enter__(self):
+        self._token = _active_counter.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_counter.reset(self._token)
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,80 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from tasks import profiling
+from tasks.metrics import QueryCounter, registry
+
+UNRESOLVED = "unresolved"
+
+
+def view_label(request):
+    """
+    The URL name of the request's view; everything under the admin site is
+    grouped as "admin" to keep the number of series small.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED
+    if match.namespaces and match.namespaces[0] == "admin":
+        return "admin"
+    return match.view_name or match._func_path
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status, database queries and response size of every
+    request in tasks.metrics.registry. Works as both a sync (WSGI) and an
+    async (ASGI) middleware; place it first so it times the whole stack.
+
+    Streaming responses are timed until their headers are ready, and their
+    body size is not counted.
+
+    TASKS_TEMPLATE_PROFILE_RATE of the requests also get their template
+    rendering timed (see tasks.profiling).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.profile_rate = getattr(settings, "TASKS_TEMPLATE_PROFILE_RATE", 0.0)
+        if self.profile_rate:
+            profiling.install()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with QueryCounter() as queries, profiling.sample(self.profile_rate) as profile:
+            response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - started, queries, profile)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with QueryCounter() as queries, profiling.sample(self.profile_rate) as profile:
+            response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - started, queries, profile)
+        return response
+
+    def _record(self, request, response, seconds, queries, profile):
+        view = view_label(request)
+        registry.observe_request(
+            view,
+            request.method,
+            response.status_code,
+            seconds,
+            queries=queries.count,
+            query_seconds=queries.seconds,
+            response_bytes=0 if response.streaming else len(response.content),
+        )
+        if profile is not None:
+            registry.observe_templates(view, profile.timings)
+            if settings.DEBUG and profile.timings:
+                response["Server-Timing"] = profile.server_timing()
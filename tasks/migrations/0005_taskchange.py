@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:23
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def journal_existing_tasks(apps, schema_editor):
+    """Give tasks written before the journal a "created" entry, so a full sync sees them."""
+    Task = apps.get_model('tasks', 'Task')
+    TaskChange = apps.get_model('tasks', 'TaskChange')
+    pks = Task.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=2000)
+    TaskChange.objects.bulk_create((TaskChange(task_id=pk, action='created') for pk in pks), batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_modified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField(db_index=True)),
+                ('action', models.CharField(
+                    choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted'), ('compacted', 'Compacted')],
+                    max_length=9,
+                )),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(journal_existing_tasks, migrations.RunPython.noop),
+    ]
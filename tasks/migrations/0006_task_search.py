@@ -0,0 +1,81 @@
+from django.db import migrations
+
+# SQLite: FTS5 index over tasks_task.title (external content, so titles are
+# not stored twice), kept in sync by triggers. unicode61 with
+# remove_diacritics folds case and accents; the prefix indexes serve the
+# "term*" queries of tasks.search.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tasks_task_fts USING fts5(
+        title,
+        content='tasks_task',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO tasks_task_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS tasks_task_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_task_fts_insert",
+    "DROP TABLE IF EXISTS tasks_task_fts",
+]
+
+# PostgreSQL: a French configuration that also strips accents, and a GIN
+# expression index matching the to_tsvector() call of tasks.search.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE TEXT SEARCH CONFIGURATION tasks_french (COPY = french)",
+    """
+    ALTER TEXT SEARCH CONFIGURATION tasks_french
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem
+    """,
+    """
+    CREATE INDEX tasks_task_title_search ON tasks_task
+        USING gin (to_tsvector('tasks_french'::regconfig, title))
+    """,
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS tasks_task_title_search",
+    "DROP TEXT SEARCH CONFIGURATION IF EXISTS tasks_french",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_taskchange'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
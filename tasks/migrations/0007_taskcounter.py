@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:31
+
+from django.db import migrations, models
+
+# Counter upkeep in the same transaction as every tasks_task write. Upserts,
+# so a missing counter row is recreated rather than silently not updated.
+SQLITE_INCREMENT = (
+    "INSERT INTO tasks_taskcounter (complete, count) VALUES ({row}.complete, {delta}) "
+    "ON CONFLICT (complete) DO UPDATE SET count = count + {delta};"
+)
+SQLITE_FORWARD = [
+    f"""
+    CREATE TRIGGER tasks_taskcounter_insert AFTER INSERT ON tasks_task BEGIN
+        {SQLITE_INCREMENT.format(row='new', delta=1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_taskcounter_delete AFTER DELETE ON tasks_task BEGIN
+        {SQLITE_INCREMENT.format(row='old', delta=-1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_taskcounter_update AFTER UPDATE OF complete ON tasks_task
+    WHEN old.complete != new.complete BEGIN
+        {SQLITE_INCREMENT.format(row='old', delta=-1)}
+        {SQLITE_INCREMENT.format(row='new', delta=1)}
+    END
+    """,
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS tasks_taskcounter_update",
+    "DROP TRIGGER IF EXISTS tasks_taskcounter_delete",
+    "DROP TRIGGER IF EXISTS tasks_taskcounter_insert",
+]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION tasks_taskcounter_upkeep() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.complete = NEW.complete THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            INSERT INTO tasks_taskcounter (complete, count) VALUES (OLD.complete, -1)
+                ON CONFLICT (complete) DO UPDATE SET count = tasks_taskcounter.count - 1;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            INSERT INTO tasks_taskcounter (complete, count) VALUES (NEW.complete, 1)
+                ON CONFLICT (complete) DO UPDATE SET count = tasks_taskcounter.count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_taskcounter_upkeep AFTER INSERT OR DELETE OR UPDATE OF complete ON tasks_task
+        FOR EACH ROW EXECUTE FUNCTION tasks_taskcounter_upkeep()
+    """,
+]
+POSTGRES_BACKWARD = [
+    "DROP TRIGGER IF EXISTS tasks_taskcounter_upkeep ON tasks_task",
+    "DROP FUNCTION IF EXISTS tasks_taskcounter_upkeep()",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+
+    return run
+
+
+def count_existing_tasks(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskCounter = apps.get_model('tasks', 'TaskCounter')
+    for complete in (False, True):
+        TaskCounter.objects.update_or_create(
+            complete=complete,
+            defaults={'count': Task.objects.filter(complete=complete).count()},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('complete', models.BooleanField(unique=True)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+        migrations.RunPython(count_existing_tasks, migrations.RunPython.noop),
+    ]
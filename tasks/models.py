@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 
 # Create your models here.
@@ -6,6 +7,74 @@ class Task(models.Model):
     title = models.CharField(max_length=200)
     complete = models.BooleanField(default=False)
     created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the home list (see tasks.pagination).
+            models.Index(fields=["-created", "-id"], name="task_created_id_idx"),
+            # Partial indexes backing the ?status=open|done filters of the home list.
+            models.Index(
+                fields=["-created", "-id"],
+                condition=models.Q(complete=False),
+                name="task_open_created_id_idx",
+            ),
+            models.Index(
+                fields=["-created", "-id"],
+                condition=models.Q(complete=True),
+                name="task_done_created_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        # Keeps the TaskChange row written by tasks.signals in the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class TaskChange(models.Model):
+    """
+    Append-only journal of Task writes, read by the /sync endpoint.
+
+    Its id is the sync cursor. Rows refer to tasks by id only, so tombstones
+    outlive the tasks they record (see tasks.journal for compaction).
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    # Placeholder keeping the id of the newest tombstone dropped by compaction.
+    COMPACTED = "compacted"
+    ACTIONS = [
+        (CREATED, "Created"),
+        (UPDATED, "Updated"),
+        (DELETED, "Deleted"),
+        (COMPACTED, "Compacted"),
+    ]
+
+    task_id = models.BigIntegerField(db_index=True)
+    action = models.CharField(max_length=9, choices=ACTIONS)
+    at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.action} task {self.task_id}"
+
+
+class TaskCounter(models.Model):
+    """
+    Number of open and done tasks, one row per state, so the list header
+    reads them in O(1) instead of counting Task rows.
+
+    Maintained by database triggers on tasks_task (migration 0007), which
+    see every write path, bulk and raw ones included; `manage.py
+    recount_tasks` rebuilds it from the Task table.
+    """
+
+    complete = models.BooleanField(unique=True)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{'done' if self.complete else 'open'}: {self.count}"
@@ -0,0 +1,116 @@
+"""
+Sampled render timing of templates, {% include %} tags and {% url %} tags.
+
+With TASKS_TEMPLATE_PROFILE_RATE above 0, MetricsMiddleware calls install()
+to wrap Template._render, IncludeNode.render and URLNode.render, then
+profiles that fraction of requests. Outside a profiled request each wrapper
+costs one context variable lookup. The totals go to /metrics and, with
+DEBUG, to a Server-Timing header of the profiled response.
+
+Timings are inclusive: a template's time contains the includes and url
+tags it renders.
+"""
+
+import random
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+from django.template.base import Template
+from django.template.defaulttags import URLNode
+from django.template.loader_tags import IncludeNode
+
+TEMPLATE = "template"
+INCLUDE = "include"
+URL = "url"
+# Entries of the Server-Timing header, slowest first.
+SERVER_TIMING_LIMIT = 20
+
+_active_profile = ContextVar("tasks_template_profile", default=None)
+_originals = {}
+
+
+class TemplateProfile:
+    """Render timings of one request: (kind, name) -> [count, seconds]."""
+
+    def __init__(self):
+        self.timings = {}
+        self._token = None
+
+    def add(self, kind, name, seconds):
+        entry = self.timings.get((kind, name))
+        if entry is None:
+            self.timings[(kind, name)] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def server_timing(self):
+        slowest = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)
+        return ", ".join(
+            f'{kind};dur={seconds * 1000:.2f};desc="{name} x{count}"'
+            for (kind, name), (count, seconds) in slowest[:SERVER_TIMING_LIMIT]
+        )
+
+    def __enter__(self):
+        self._token = _active_profile.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_profile.reset(self._token)
+
+
+def sample(rate):
+    """A TemplateProfile for `rate` of the calls, else a context yielding None."""
+    if rate and random.random() < rate:
+        return TemplateProfile()
+    return nullcontext()
+
+
+def _template_name(template):
+    return template.origin.template_name or template.name or "<string>"
+
+
+def _include_name(node):
+    # Where the tag is; the included template is timed as a template too.
+    return f"{node.origin.template_name or '<string>'}:{node.token.lineno}"
+
+
+def _url_name(node):
+    return node.view_name.token.strip("'\"")
+
+
+def _timed(kind, label, render):
+    @wraps(render)
+    def wrapper(self, context):
+        profile = _active_profile.get()
+        if profile is None:
+            return render(self, context)
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            profile.add(kind, label(self), time.perf_counter() - started)
+
+    return wrapper
+
+
+def install():
+    """Wrap the render methods; idempotent."""
+    if _originals:
+        return
+    for cls, attribute, kind, label in (
+        (Template, "_render", TEMPLATE, _template_name),
+        (IncludeNode, "render", INCLUDE, _include_name),
+        (URLNode, "render", URL, _url_name),
+    ):
+        original = getattr(cls, attribute)
+        _originals[(cls, attribute)] = original
+        setattr(cls, attribute, _timed(kind, label, original))
+
+
+def uninstall():
+    for (cls, attribute), original in _originals.items():
+        setattr(cls, attribute, original)
+    _originals.clear()
@@ -0,0 +1,175 @@
+"""
+Full-text search over task titles (?q= on the home list).
+
+SQLite uses the FTS5 table tasks_task_fts, PostgreSQL a GIN index on
+to_tsvector('tasks_french', title); both are created, and kept in sync, by
+migration 0006. Matching is case- and accent-insensitive and every term is a
+prefix ("cour" finds "Courses"); all terms must match.
+
+Results are ranked best first (bm25 / ts_rank) and keyset paginated on
+(rank, id), the same way tasks.pagination pages the plain list on
+(created, id).
+
+Note: Django rebuilds SQLite tables for some schema changes, which drops
+their triggers; tasks.triggers recreates them after `migrate`.
+"""
+
+import base64
+import math
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from tasks.filters import STATUS_FILTERS, parse_id
+from tasks.models import Task
+from tasks.pagination import KeysetPage
+
+MAX_QUERY_LENGTH = 200
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"[^\W_]+")
+
+
+def get_query(params):
+    """Return the search string of `params` (?q=), stripped and bounded."""
+    return params.get("q", "").strip()[:MAX_QUERY_LENGTH]
+
+
+def search_terms(query):
+    """Split a search string into word terms; punctuation and search operators are dropped."""
+    return _TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def encode_cursor(rank, pk):
+    raw = f"{rank!r}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Decode a search cursor, returning (rank, id) or None if it is malformed."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        rank, pk = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        rank, pk = float(rank), parse_id(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    # Both are bound into the raw SQL: an id past the 64-bit range overflows.
+    if pk is None or not math.isfinite(rank):
+        return None
+    return rank, pk
+
+
+def _match_source(terms):
+    """
+    FROM/WHERE clause selecting the tasks matching `terms` (as `t`), the SQL
+    expressions of their id and rank (lower is better), and its params.
+    """
+    table = Task._meta.db_table
+    if connection.vendor == "postgresql":
+        return (
+            f"FROM {table} t, to_tsquery('tasks_french', %s) query "
+            f"WHERE to_tsvector('tasks_french', t.title) @@ query",
+            "t.id",
+            # Normalized by document length like bm25; float8 so that the
+            # rank read back into a cursor compares equal to the stored one.
+            "-ts_rank(to_tsvector('tasks_french', t.title), query, 1)::float8",
+            [" & ".join(f"{term}:*" for term in terms)],
+        )
+    # Quoted FTS5 terms are never read as operators.
+    return (
+        f"FROM tasks_task_fts JOIN {table} t ON t.id = tasks_task_fts.rowid WHERE tasks_task_fts MATCH %s",
+        "tasks_task_fts.rowid",
+        "bm25(tasks_task_fts)",
+        [" ".join(f'"{term}"*' for term in terms)],
+    )
+
+
+def filter_by_search(queryset, query):
+    """Restrict a Task queryset to the tasks matching `query`; unchanged when it has no terms."""
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    source, id_expr, _, params = _match_source(terms)
+    return queryset.filter(id__in=RawSQL(f"SELECT {id_expr} {source}", params))
+
+
+def _too_broad(source, params, limit):
+    """Whether more than `limit` tasks match: a bounded count, stopping at limit + 1 rows."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM (SELECT 1 {source} LIMIT %s) matches", [*params, limit + 1])
+        return cursor.fetchone()[0] > limit
+
+
+def _page_sql(source, id_expr, rank_expr, params, status, after_key, before_key, page_size, ranked):
+    """SQL fetching (id, rank) rows of one page, and whether it walks backwards."""
+    params = list(params)
+    if "complete" in STATUS_FILTERS[status]:
+        source += " AND t.complete = %s"
+        params.append(STATUS_FILTERS[status]["complete"])
+
+    if not ranked:
+        # Newest first: a walk of the index in id order, rank fixed at 0.
+        # A float on every backend (PostgreSQL reads a bare 0.0 as numeric).
+        sql = f"SELECT {id_expr}, CAST(0 AS DOUBLE PRECISION) {source}"
+        if before_key is not None:
+            sql += f" AND {id_expr} > %s ORDER BY {id_expr} ASC LIMIT %s"
+            return sql, [*params, before_key[1], page_size + 1], True
+        if after_key is not None:
+            sql += f" AND {id_expr} < %s"
+            params.append(after_key[1])
+        return f"{sql} ORDER BY {id_expr} DESC LIMIT %s", [*params, page_size + 1], False
+
+    sql = f"SELECT id, rank FROM (SELECT {id_expr} AS id, {rank_expr} AS rank {source}) matches"
+    if before_key is not None:
+        rank, pk = before_key
+        sql += " WHERE rank < %s OR (rank = %s AND id > %s) ORDER BY rank DESC, id ASC LIMIT %s"
+        return sql, [*params, rank, rank, pk, page_size + 1], True
+    if after_key is not None:
+        rank, pk = after_key
+        sql += " WHERE rank > %s OR (rank = %s AND id < %s)"
+        params += [rank, rank, pk]
+    return f"{sql} ORDER BY rank ASC, id DESC LIMIT %s", [*params, page_size + 1], False
+
+
+def paginate_search(query, status="all", after=None, before=None, page_size=50):
+    """
+    Return a KeysetPage of the tasks matching `query`, best match first.
+
+    Ranking scores every match, so when more than TASKS_SEARCH_RANK_LIMIT
+    tasks match (a query too vague for ranking to help much) results come
+    newest first instead, which only reads the page it returns.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return KeysetPage([])
+
+    source, id_expr, rank_expr, params = _match_source(terms)
+    ranked = not _too_broad(source, params, getattr(settings, "TASKS_SEARCH_RANK_LIMIT", 5000))
+    after_key = decode_cursor(after)
+    sql, params, backwards = _page_sql(
+        source, id_expr, rank_expr, params, status, after_key, decode_cursor(before), page_size, ranked,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    if not rows:
+        return paginate_search(query, status, page_size=page_size) if backwards else KeysetPage([])
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size][::-1] if backwards else rows[:page_size]
+    tasks = Task.objects.in_bulk([pk for pk, _ in rows])
+    items = [tasks[pk] for pk, _ in rows if pk in tasks]
+
+    first = encode_cursor(rows[0][1], rows[0][0])
+    last = encode_cursor(rows[-1][1], rows[-1][0])
+    if backwards:
+        return KeysetPage(items, next_cursor=last, previous_cursor=first if has_more else None)
+    return KeysetPage(
+        items,
+        next_cursor=last if has_more else None,
+        previous_cursor=first if after_key is not None else None,
+    )
@@ -0,0 +1,137 @@
+"""
+Production server behind `manage.py serve`: gunicorn, with the application
+preloaded.
+
+The master process loads the application once (settings, apps, URLconf,
+views, templates) before gunicorn forks the workers, which inherit it: the
+loaded code is shared copy-on-write instead of being imported again by every
+worker, and a new worker is ready as soon as it is forked. gc.freeze() keeps
+the preloaded objects out of the collections run by the workers, which would
+otherwise write to (and so copy) their pages.
+
+WSGI workers are gunicorn's threaded workers; ASGI workers are uvicorn's
+(uvicorn-worker package), which stream responses such as the /events
+Server-Sent Events. gunicorn and uvicorn-worker are only needed here.
+
+Signals of the master are gunicorn's: TERM stops gracefully, INT and QUIT
+stop at once, HUP replaces the workers gracefully (with the preloaded code),
+USR2 starts a new master loading the new code on the same socket, after
+which TERM stops the previous one.
+
+Each worker keeps its own metrics, template profile and event broker (see
+TASKS_EVENT_BROKER): /metrics reports the worker that answered it, and
+/events only receives the changes made through the same worker. The
+task-list cache, on the other hand, must be shared (see tasks.cache), which
+`manage.py serve` checks.
+"""
+
+import gc
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+INTERFACES = ("wsgi", "asgi")
+WORKER_CLASSES = {"wsgi": "gthread", "asgi": "uvicorn_worker.UvicornWorker"}
+# Threads of each WSGI worker, i.e. requests it serves concurrently.
+WSGI_THREADS = 8
+# Seconds an idle keep-alive connection is kept open.
+KEEP_ALIVE = 5
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def parse_bind(bind):
+    """"host:port", "[ipv6]:port" or "port" -> (host, port)."""
+    host, sep, port = bind.rpartition(":")
+    if not sep:
+        host = "127.0.0.1"
+    host = host.strip("[]")
+    if not port.isdigit() or not host:
+        raise ValueError(f"Invalid address {bind!r}, expected host:port.")
+    return host, int(port)
+
+
+def load_application(interface):
+    """Load everything a request needs, then prepare the process for forking."""
+    if interface == "asgi":
+        from django.core.asgi import get_asgi_application
+
+        from todo.database import use_asgi_connections
+
+        application = get_asgi_application()
+        use_asgi_connections(settings.DATABASES)
+    else:
+        from django.core.wsgi import get_wsgi_application
+
+        application = get_wsgi_application()
+
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns  # noqa: B018 (imports the URLconf and views)
+    _preload_templates()
+    if "django.contrib.staticfiles" in settings.INSTALLED_APPS:
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        staticfiles_storage.base_url  # noqa: B018 (reads the manifest of hashed names)
+    # Never share a database connection between processes.
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    return application
+
+
+def _preload_templates():
+    """Compile the project's own templates into the cached template loaders."""
+    from django.template import engines
+
+    base_dir = Path(settings.BASE_DIR).resolve()
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            directory = Path(directory).resolve()
+            if base_dir not in directory.parents:
+                continue
+            for path in sorted(directory.rglob("*.html")):
+                engine.get_template(path.relative_to(directory).as_posix())
+
+
+def uses_local_memory_cache():
+    """Whether the task-list cache lives in each process (see tasks.cache)."""
+    from django.core.cache.backends.locmem import LocMemCache
+
+    from tasks.cache import get_cache
+
+    return isinstance(get_cache(), LocMemCache)
+
+
+def gunicorn_options(interface, bind, workers, max_requests=0, max_requests_jitter=0, graceful_timeout=30):
+    """gunicorn settings of `manage.py serve`."""
+    return {
+        "bind": [bind],
+        "workers": workers,
+        "worker_class": WORKER_CLASSES[interface],
+        "threads": WSGI_THREADS,
+        "keepalive": KEEP_ALIVE,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests_jitter,
+        "graceful_timeout": graceful_timeout,
+        "preload_app": True,
+    }
+
+
+def run(application, options):
+    """Serve the preloaded `application` with gunicorn until the master stops."""
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return application
+
+    Server().run()
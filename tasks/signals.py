@@ -0,0 +1,44 @@
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tasks import events, journal
+from tasks.cache import bump_version
+from tasks.models import Task, TaskChange
+
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_task_list(sender, **kwargs):
+    # Bump right away, and again once the write is visible to other
+    # connections so nothing rendered from pre-commit data survives.
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_save, sender=Task)
+def journal_task_saved(sender, instance, created, **kwargs):
+    journal.record(TaskChange.CREATED if created else TaskChange.UPDATED, [instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def journal_task_deleted(sender, instance, **kwargs):
+    journal.record(TaskChange.DELETED, [instance.pk])
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, created, **kwargs):
+    kind = "created" if created else "updated"
+    transaction.on_commit(lambda: events.publish_task_event(kind, instance))
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: events.publish_task_event("deleted", pk=pk))
+
+
+@receiver(setting_changed)
+def reset_event_broker(setting, **kwargs):
+    if setting == "TASKS_EVENT_BROKER":
+        events.reset_broker()
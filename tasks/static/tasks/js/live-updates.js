@@ -0,0 +1,47 @@
+// Live updates: apply the task changes streamed by the server to the rows shown.
+// Loaded by tasks/list.html, whose <script> tag carries the stream URL in data-events-url.
+(function () {
+    if (!window.EventSource) {
+        return;
+    }
+    var params = new URLSearchParams(window.location.search);
+    var status = params.get("status") || "all";
+    // New tasks are only inserted on the first page of the unsearched list.
+    var firstPage = !params.has("after") && !params.has("before") && !params.get("q");
+    var source = new EventSource(document.currentScript.dataset.eventsUrl);
+
+    function shown(event) {
+        return status === "all" || (status === "done") === event.complete;
+    }
+
+    function rowFrom(html) {
+        var template = document.createElement("template");
+        template.innerHTML = html.trim();
+        return template.content.firstChild;
+    }
+
+    function apply(message) {
+        var event = JSON.parse(message.data);
+        var row = document.getElementById("task-" + event.id);
+        if (event.type === "deleted" || !shown(event)) {
+            if (row) {
+                row.remove();
+            }
+        } else if (row) {
+            row.replaceWith(rowFrom(event.html));
+        } else if (event.type === "created" && firstPage) {
+            var empty = document.getElementById("no-tasks");
+            if (empty) {
+                empty.remove();
+            }
+            document.getElementById("task-rows").prepend(rowFrom(event.html));
+        }
+    }
+
+    source.addEventListener("created", apply);
+    source.addEventListener("updated", apply);
+    source.addEventListener("deleted", apply);
+    source.addEventListener("refresh", function () {
+        window.location.reload();
+    });
+})();
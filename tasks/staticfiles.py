@@ -0,0 +1,124 @@
+"""
+Static assets: content-hashed and precompressed by collectstatic, served by
+the application with far-future cache headers.
+
+CompressedManifestStaticFilesStorage (the staticfiles storage of
+todo.settings.production) writes `name.gz`, and `name.br` when the brotli
+package is installed, next to every hashed text asset. serveStatic answers
+STATIC_URL from STATIC_ROOT with the smallest encoding the client accepts;
+hashed names never change content, so they are cached for a year as
+immutable and kept in memory once read.
+"""
+
+import gzip
+import mimetypes
+import os
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # optional: without it only the .gz variants are written
+    brotli = None
+
+COMPRESSIBLE = (".css", ".js", ".svg", ".txt", ".json", ".map", ".xml", ".html")
+MIN_COMPRESS_SIZE = 256
+# Preferred first.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+# name.<12 hex digits>.ext, as written by ManifestStaticFilesStorage.
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes gzip and brotli variants."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if not dry_run:
+            for name in set(self.hashed_files.values()):
+                self.compress(name)
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE):
+            return
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(data):
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read(), os.fstat(f.fileno()).st_mtime
+
+
+# Hashed files are immutable: read them once per process.
+_read_immutable = lru_cache(maxsize=256)(_read)
+
+
+def _find(root, path):
+    try:
+        full_path = safe_join(root, path)
+    except SuspiciousFileOperation:
+        return None
+    return full_path if os.path.isfile(full_path) else None
+
+
+def serveStatic(request, path):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    root = settings.STATIC_ROOT
+    full_path = _find(root, path) if root else None
+    if full_path is None:
+        raise Http404(f"Static file not found: {path}")
+
+    encoding = None
+    if path.endswith(COMPRESSIBLE):
+        accepted = _accepted_encodings(request)
+        for candidate, suffix in ENCODINGS:
+            if candidate in accepted and os.path.isfile(full_path + suffix):
+                encoding, full_path = candidate, full_path + suffix
+                break
+
+    immutable = bool(HASHED_NAME.search(path))
+    content, mtime = (_read_immutable if immutable else _read)(full_path)
+    if not was_modified_since(request.headers.get("If-Modified-Since"), int(mtime)):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(path)
+    response = HttpResponse(content, content_type=content_type or "application/octet-stream")
+    response["Last-Modified"] = http_date(mtime)
+    response["Cache-Control"] = IMMUTABLE if immutable else REVALIDATE
+    if path.endswith(COMPRESSIBLE):
+        response["Vary"] = "Accept-Encoding"
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return response
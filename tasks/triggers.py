@@ -0,0 +1,129 @@
+"""
+The triggers on tasks_task: full-text index upkeep on SQLite (migration 0006)
+and task counter upkeep (migration 0007).
+
+On SQLite, Django applies most schema changes by rebuilding the table (copy
+into a new table, drop the old one, rename), which drops its triggers without
+a word: the search index and the counters would silently go stale after any
+later migration altering Task. `ensure_triggers` runs after every `migrate`
+(post_migrate signal), recreates the missing triggers and resynchronises what
+they maintain; the tasks.W001 check reports them missing.
+"""
+
+from django.core import checks
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# Statements are the ones of migrations 0006 and 0007, keyed by the table that
+# must exist (i.e. the migration that must be applied) for them to apply.
+SQLITE_INCREMENT = (
+    "INSERT INTO tasks_taskcounter (complete, count) VALUES ({row}.complete, {delta}) "
+    "ON CONFLICT (complete) DO UPDATE SET count = count + {delta};"
+)
+TRIGGERS = {
+    "sqlite": {
+        "tasks_task_fts": {
+            "tasks_task_fts_insert": """
+                CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+                    INSERT INTO tasks_task_fts(rowid, title) VALUES (new.id, new.title);
+                END
+            """,
+            "tasks_task_fts_delete": """
+                CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+                    INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                END
+            """,
+            "tasks_task_fts_update": """
+                CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title ON tasks_task BEGIN
+                    INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                    INSERT INTO tasks_task_fts(rowid, title) VALUES (new.id, new.title);
+                END
+            """,
+        },
+        "tasks_taskcounter": {
+            "tasks_taskcounter_insert": f"""
+                CREATE TRIGGER tasks_taskcounter_insert AFTER INSERT ON tasks_task BEGIN
+                    {SQLITE_INCREMENT.format(row='new', delta=1)}
+                END
+            """,
+            "tasks_taskcounter_delete": f"""
+                CREATE TRIGGER tasks_taskcounter_delete AFTER DELETE ON tasks_task BEGIN
+                    {SQLITE_INCREMENT.format(row='old', delta=-1)}
+                END
+            """,
+            "tasks_taskcounter_update": f"""
+                CREATE TRIGGER tasks_taskcounter_update AFTER UPDATE OF complete ON tasks_task
+                WHEN old.complete != new.complete BEGIN
+                    {SQLITE_INCREMENT.format(row='old', delta=-1)}
+                    {SQLITE_INCREMENT.format(row='new', delta=1)}
+                END
+            """,
+        },
+    },
+    "postgresql": {
+        "tasks_taskcounter": {
+            "tasks_taskcounter_upkeep": """
+                CREATE TRIGGER tasks_taskcounter_upkeep AFTER INSERT OR DELETE OR UPDATE OF complete ON tasks_task
+                    FOR EACH ROW EXECUTE FUNCTION tasks_taskcounter_upkeep()
+            """,
+        },
+    },
+}
+
+# Brings back in sync what the triggers of a table maintain.
+RESYNC = {
+    "tasks_task_fts": "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+    "tasks_taskcounter": (
+        "UPDATE tasks_taskcounter SET count = "
+        "(SELECT COUNT(*) FROM tasks_task WHERE tasks_task.complete = tasks_taskcounter.complete)"
+    ),
+}
+
+
+def _trigger_names(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tasks_task'")
+        else:
+            cursor.execute("SELECT tgname FROM pg_trigger WHERE tgrelid = 'tasks_task'::regclass AND NOT tgisinternal")
+        return {name for (name,) in cursor.fetchall()}
+
+
+def missing_triggers(connection):
+    """Return {table: [trigger names]} of the triggers missing on tasks_task."""
+    triggers = TRIGGERS.get(connection.vendor, {})
+    tables = set(connection.introspection.table_names())
+    if not triggers or "tasks_task" not in tables:
+        return {}
+    existing = _trigger_names(connection)
+    missing = {
+        table: [name for name in statements if name not in existing]
+        for table, statements in triggers.items()
+        if table in tables
+    }
+    return {table: names for table, names in missing.items() if names}
+
+
+def ensure_triggers(using=DEFAULT_DB_ALIAS, **kwargs):
+    """Recreate the missing triggers (post_migrate handler); returns their names."""
+    connection = connections[using]
+    missing = missing_triggers(connection)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for table, names in missing.items():
+            for name in names:
+                cursor.execute(TRIGGERS[connection.vendor][table][name])
+            cursor.execute(RESYNC[table])
+    return [name for names in missing.values() for name in names]
+
+
+def check_triggers(app_configs, databases=None, **kwargs):
+    """tasks.W001: triggers missing on tasks_task (database check, e.g. `check --database default`)."""
+    errors = []
+    for alias in databases or ():
+        missing = [name for names in missing_triggers(connections[alias]).values() for name in names]
+        if missing:
+            errors.append(checks.Warning(
+                f"Triggers missing on tasks_task in database {alias!r}: {', '.join(missing)}.",
+                hint="The search index and task counters are stale; run `manage.py migrate` to recreate them.",
+                id="tasks.W001",
+            ))
+    return errors
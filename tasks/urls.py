@@ -1,10 +1,24 @@
+from django.conf import settings
 from django.urls import path
 
-from tasks.views import deleteTask, index, updateTask
+from tasks.api import apiSync, apiTask, apiTaskBatch, apiTasks
+from tasks.async_views import taskEvents
+from tasks.views import bulkTasks, deleteTask, exportTasks, index, metrics, updateTask
+
+if getattr(settings, "TASKS_ASYNC_VIEWS", False):
+    from tasks.async_views import deleteTask, index, updateTask  # noqa: F811
 
 urlpatterns = [
     path('', index, name="list"),
     path('update_task/<str:pk>/', updateTask, name="update_task"),
-    path('delete_task/<str:pk>/', deleteTask, name="delete_task")
+    path('delete_task/<str:pk>/', deleteTask, name="delete_task"),
+    path('bulk/', bulkTasks, name="bulk_tasks"),
+    path('export.<str:fmt>', exportTasks, name="export_tasks"),
+    path('events/', taskEvents, name="task_events"),
+    path('api/tasks/', apiTasks, name="api_tasks"),
+    path('api/tasks/batch/', apiTaskBatch, name="api_task_batch"),
+    path('api/tasks/<int:pk>/', apiTask, name="api_task"),
+    path('sync', apiSync, name="sync"),
+    path('metrics', metrics, name="metrics")
 
 ]
@@ -1,31 +1,158 @@
+import hashlib
+
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.utils.functional import SimpleLazyObject
+from django.utils.safestring import mark_safe
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import condition, require_POST
 
+from tasks.bulk import ACTIONS, apply_bulk_action
+from tasks.cache import cached_fragment, cached_value, get_version
+from tasks.counters import task_counts
+from tasks.dataset import CSV, EXPORT_FORMATS, JSON, NDJSON, aiter_export, iter_export
+from tasks.db import retry_on_locked
+from tasks.filters import filter_by_status, get_status, list_url, parse_id, parse_since
 from tasks.forms import TaskForm
+from tasks.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from tasks.metrics import registry
 from tasks.models import Task
+from tasks.pagination import paginate_keyset
+from tasks.search import filter_by_search, get_query, paginate_search, search_terms
+
+
+def _wants_fragment(request):
+    """htmx requests, or ones accepting text/html+fragment, get partial responses."""
+    return request.headers.get("HX-Request") == "true" or "text/html+fragment" in request.headers.get("Accept", "")
+
+
+def _row_response(request, task, status, code=200):
+    html = render_to_string('tasks/task_row.html', {'task': task, 'status': status}, request=request)
+    return HttpResponse(html, status=code)
+
+
+def _errors_response(form):
+    return HttpResponse(form.errors.as_ul(), status=422)
+
+
+def _validator(*parts):
+    return hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _page_parts(request):
+    """
+    Validator parts shared by every page: app version, status filter and CSRF
+    cookie, the latter since pages embed a token derived from it.
+    """
+    return (
+        getattr(settings, "APP_VERSION", "dev"),
+        get_status(request.GET),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+    )
+
+
+def _list_validator(request, version):
+    return _validator(
+        *_page_parts(request),
+        version,
+        get_query(request.GET),
+        request.GET.get("after"),
+        request.GET.get("before"),
+        getattr(settings, "TASKS_PAGE_SIZE", 50),
+    )
+
+
+def _list_etag(request):
+    return _list_validator(request, get_version())
+
+
+def _task_validator(request, pk, modified):
+    if modified is None:
+        return None
+    return _validator(*_page_parts(request), pk, modified.isoformat())
+
+
+def _task_modified(request, pk):
+    # Memoized so the ETag and Last-Modified validators share a single query.
+    if not hasattr(request, "_task_modified"):
+        request._task_modified = Task.objects.filter(pk=pk).values_list("modified", flat=True).first()
+    return request._task_modified
+
+
+def _task_etag(request, pk):
+    return _task_validator(request, pk, _task_modified(request, pk))
+
+
+def _task_last_modified(request, pk):
+    return _task_modified(request, pk)
 
 
 # Create your views here.
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_list_etag)
+@retry_on_locked
 def index(request):
-    tasks = Task.objects.all().order_by("-created")
+    status = get_status(request.GET)
+    query = get_query(request.GET)
+    after = request.GET.get("after")
+    before = request.GET.get("before")
+    page_size = getattr(settings, "TASKS_PAGE_SIZE", 50)
     form = TaskForm()
 
     if request.method == 'POST':
         form = TaskForm(request.POST)
         if form.is_valid():
             # adds to the database if valid
-            form.save()
-            return redirect('/')
+            task = form.save()
+            if _wants_fragment(request):
+                return _row_response(request, task, status, code=201)
+            return redirect(list_url(status))
+        if _wants_fragment(request):
+            return _errors_response(form)
+
+    def get_page():
+        if search_terms(query):
+            return paginate_search(query, status, after=after, before=before, page_size=page_size)
+        return paginate_keyset(
+            filter_by_status(Task.objects.all(), status),
+            after=after,
+            before=before,
+            page_size=page_size,
+        )
+
+    # Only evaluated when the rendered rows are not cached.
+    page = SimpleLazyObject(get_page)
+    tasks = SimpleLazyObject(lambda: page.items)
+    task_rows = cached_fragment(
+        ("list", status, query, after, before, page_size),
+        lambda: render_to_string(
+            'tasks/task_rows.html', {'tasks': tasks, 'page': page, 'status': status, 'q': query},
+        ),
+    )
 
     context = {
         'tasks': tasks,
+        'page': page,
+        'task_rows': mark_safe(task_rows),
+        'status': status,
+        'q': query,
+        'counts': cached_value(("counts",), task_counts),
         'form': form,
         'app_version': getattr(settings, "APP_VERSION", "dev"),
+        # /events/ answers 501 under WSGI.
+        'live_updates': isinstance(request, ASGIRequest),
     }
     return render(request, 'tasks/list.html', context)
 
 
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_task_etag, last_modified_func=_task_last_modified)
+@retry_on_locked
 def updateTask(request, pk):
+    status = get_status(request.GET)
     task = Task.objects.get(id=pk)
     form = TaskForm(instance=task)
 
@@ -33,21 +160,90 @@ def updateTask(request, pk):
         form = TaskForm(request.POST, instance=task)
         if form.is_valid():
             form.save()
-            return redirect('/')
+            if _wants_fragment(request):
+                return _row_response(request, task, status)
+            return redirect(list_url(status))
+        if _wants_fragment(request):
+            return _errors_response(form)
 
     context = {
         'form': form,
-        'task': task
+        'task': task,
+        'list_url': list_url(status),
     }
     return render(request, 'tasks/update_task.html', context)
 
 
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_task_etag, last_modified_func=_task_last_modified)
+@retry_on_locked
 def deleteTask(request, pk):
+    status = get_status(request.GET)
     item = Task.objects.get(id=pk)
 
     if request.method == "POST":
         item.delete()
-        return redirect('/')
+        if _wants_fragment(request):
+            return HttpResponse(status=204)
+        return redirect(list_url(status))
 
-    context = {'item': item}
+    context = {
+        'item': item,
+        'list_url': list_url(status),
+    }
     return render(request, 'tasks/delete.html', context)
+
+
+EXPORT_CONTENT_TYPES = {
+    JSON: "application/json",
+    NDJSON: "application/x-ndjson",
+    CSV: "text/csv",
+}
+
+
+def exportTasks(request, fmt):
+    if fmt not in EXPORT_FORMATS:
+        raise Http404(f"Unknown export format: {fmt}")
+    try:
+        since = parse_since(request.GET.get("since"))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    tasks = filter_by_status(Task.objects.all(), get_status(request.GET))
+    if since is not None:
+        tasks = tasks.filter(created__gte=since)
+
+    # Under ASGI a sync iterator would be read to the end before the first byte.
+    chunks = aiter_export(tasks, fmt) if isinstance(request, ASGIRequest) else iter_export(tasks, fmt)
+    response = StreamingHttpResponse(
+        chunks,
+        content_type=f"{EXPORT_CONTENT_TYPES[fmt]}; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="tasks.{fmt}"'
+    return response
+
+
+@require_POST
+@retry_on_locked
+def bulkTasks(request):
+    status = get_status(request.GET)
+    query = get_query(request.GET)
+    action = request.POST.get("action")
+    if action not in ACTIONS:
+        return HttpResponseBadRequest(f"Unknown bulk action: {action}")
+
+    if request.POST.get("scope") == "filter":
+        # The tasks listed by the page: its status filter and its search.
+        tasks = filter_by_search(filter_by_status(Task.objects.all(), status), query)
+    else:
+        ids = [pk for pk in map(parse_id, request.POST.getlist("ids")) if pk is not None]
+        tasks = Task.objects.filter(pk__in=ids)
+
+    apply_bulk_action(tasks, action, chunk_size=getattr(settings, "TASKS_BULK_CHUNK_SIZE", 500))
+    return redirect(list_url(status, query))
+
+
+@never_cache
+def metrics(request):
+    """Request metrics of this process, in Prometheus text format."""
+    return HttpResponse(registry.render(), content_type=METRICS_CONTENT_TYPE)
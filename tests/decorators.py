@@ -1,3 +1,4 @@
+import inspect
 from functools import wraps
 
 
@@ -5,9 +6,15 @@ def tc(test_id: str):
     """Decorator to attach a test ID to a test method."""
 
     def decorator(fn):
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
-            return fn(*args, **kwargs)
+        # Async tests must stay coroutine functions for Django's test runner to await them.
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await fn(*args, **kwargs)
+        else:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                return fn(*args, **kwargs)
 
         wrapper.test_case_id = test_id
         return wrapper
@@ -1,7 +1,8 @@
 import json
+import traceback
 import unittest
 
-from django.test.runner import DiscoverRunner
+from django.test.runner import DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner
 
 
 class JsonTestResult(unittest.TextTestResult):
@@ -48,11 +49,48 @@ class JsonTestResult(unittest.TextTestResult):
 
     def stopTestRun(self):
         super().stopTestRun()
-        payload = {"tests": self.tests_data}
+        # Sorted, so that serial and parallel runs (whose workers report in
+        # completion order) write the same file.
+        payload = {"tests": sorted(self.tests_data, key=lambda data: data["test_name"])}
         with open(self.json_path, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2, ensure_ascii=False)
 
 
+class RemoteTestError(Exception):
+    """Stands for an exception of a parallel worker which cannot be pickled."""
+
+
+class JsonRemoteTestResult(RemoteTestResult):
+    """
+    Result of a `--parallel` worker: its events are replayed on the
+    JsonTestResult of the main process, which records them. Failures whose
+    traceback or exception cannot be pickled (tracebacks need tblib) are sent
+    as a RemoteTestError carrying the formatted traceback, instead of
+    aborting the whole run.
+    """
+
+    def _picklable(self, err):
+        try:
+            self._confirm_picklable(err)
+        except Exception:
+            return RemoteTestError, RemoteTestError("".join(traceback.format_exception(*err))), None
+        return err
+
+    def addError(self, test, err):
+        super().addError(test, self._picklable(err))
+
+    def addFailure(self, test, err):
+        super().addFailure(test, self._picklable(err))
+
+
+class JsonRemoteTestRunner(RemoteTestRunner):
+    resultclass = JsonRemoteTestResult
+
+
+class JsonParallelTestSuite(ParallelTestSuite):
+    runner_class = JsonRemoteTestRunner
+
+
 class JsonTextTestRunner(unittest.TextTestRunner):
     """TextTestRunner that user JsonTestResult to produce the JSON."""
 
@@ -73,11 +111,21 @@ class JsonTestRunner(DiscoverRunner):
     """Personalized Django runner that uses JsonTextTestRunner."""
 
     test_runner = JsonTextTestRunner
+    parallel_test_suite = JsonParallelTestSuite
 
     def __init__(self, *args, **kwargs):
         self.json_path = kwargs.pop("json_path", "result_test_auto.json")
         super().__init__(*args, **kwargs)
 
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--json-path",
+            default="result_test_auto.json",
+            help="Fichier du rapport JSON des tests (par défaut: result_test_auto.json).",
+        )
+
     def run_suite(self, suite, **kwargs):
         runner = self.test_runner(
             verbosity=self.verbosity,
@@ -0,0 +1,126 @@
+import json
+from unittest import mock
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from tasks.models import Task, TaskChange
+
+from ..decorators import tc
+
+# pg_advisory_xact_lock() taken before each journal write on PostgreSQL.
+JOURNAL_LOCK_QUERIES = 1 if connection.vendor == "postgresql" else 0
+
+
+class TaskApiTests(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(title="Existing task", complete=False)
+
+    def _send(self, method, url, payload):
+        return getattr(self.client, method)(url, data=json.dumps(payload), content_type="application/json")
+
+    @tc("TC028")
+    def test_list_and_create(self):
+        response = self._send("post", reverse("api_tasks"), {"title": "From API"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["title"], "From API")
+
+        response = self.client.get(reverse("api_tasks"), {"status": "open"})
+        self.assertEqual([task["title"] for task in response.json()["results"]], ["From API", "Existing task"])
+
+    @tc("TC028")
+    def test_patch_and_delete_single_task(self):
+        url = reverse("api_task", args=[self.task.id])
+
+        response = self._send("patch", url, {"complete": True})
+        self.assertEqual(response.status_code, 200)
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.complete)
+        self.assertEqual(self.task.title, "Existing task")
+
+        self.assertEqual(self._send("patch", url, {"title": ""}).status_code, 400)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    @tc("TC028")
+    def test_batch_applies_every_operation(self):
+        other = Task.objects.create(title="To delete")
+        payload = {
+            "create": [{"title": f"Batch {i}"} for i in range(3)],
+            "update": [{"id": self.task.id, "title": "Renamed", "complete": True}],
+            "delete": [other.id],
+        }
+
+        # One query per kind of operation plus two journal inserts (tombstones, then
+        # created / updated), whatever the batch size.
+        with self.assertNumQueries(8 + 2 * JOURNAL_LOCK_QUERIES):
+            response = self._send("post", reverse("api_task_batch"), payload)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body["created"]), 3)
+        self.assertEqual(body["deleted"], 1)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.complete), ("Renamed", True))
+        self.assertFalse(Task.objects.filter(id=other.id).exists())
+
+    @tc("TC028")
+    def test_batch_delete_sends_no_per_task_signals(self):
+        doomed = Task.objects.bulk_create(Task(title=f"Doomed {i}") for i in range(50))
+        with mock.patch("tasks.signals.bump_version") as per_task, mock.patch("tasks.api.bump_version") as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self._send("post", reverse("api_task_batch"), {"delete": [task.pk for task in doomed]})
+
+        self.assertEqual(response.json()["deleted"], 50)
+        per_task.assert_not_called()
+        self.assertEqual(bump.call_count, 2)
+        self.assertEqual(TaskChange.objects.filter(action=TaskChange.DELETED).count(), 50)
+
+    @tc("TC028")
+    def test_batch_is_all_or_nothing(self):
+        payload = {
+            "create": [{"title": "Valid"}, {"title": ""}],
+            "update": [{"id": 999999, "title": "Ghost"}],
+        }
+
+        response = self._send("post", reverse("api_task_batch"), payload)
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertIn("1", errors["create"])
+        self.assertIn("0", errors["update"])
+        self.assertFalse(Task.objects.filter(title="Valid").exists())
+
+    @tc("TC028")
+    def test_batch_rejects_booleans_as_ids(self):
+        # true == 1 in Python: it must not stand for task 1.
+        Task.objects.get_or_create(id=1, defaults={"title": "Task one"})
+        payload = {"update": [{"id": True, "title": "Hijacked"}], "delete": [True]}
+
+        response = self._send("post", reverse("api_task_batch"), payload)
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(errors["update"]["0"], {"id": ["Unknown task id: True"]})
+        self.assertEqual(errors["delete"], ["Task ids must be integers."])
+        self.assertTrue(Task.objects.filter(id=1).exclude(title="Hijacked").exists())
+
+    @tc("TC028")
+    def test_cross_site_posts_without_json_content_type_are_refused(self):
+        # text/plain and form bodies are sent cross-site without a CORS preflight.
+        client = Client(enforce_csrf_checks=True)
+        body = json.dumps({"delete": [self.task.id]})
+        for content_type in ("text/plain", "application/x-www-form-urlencoded", "multipart/form-data; boundary=x"):
+            with self.subTest(content_type=content_type):
+                response = client.post(reverse("api_task_batch"), data=body, content_type=content_type)
+                self.assertEqual(response.status_code, 415)
+        response = client.post(reverse("api_tasks"), data=json.dumps({"title": "Forged"}), content_type="text/plain")
+        self.assertEqual(response.status_code, 415)
+        response = client.patch(reverse("api_task", args=[self.task.id]), data=json.dumps({"title": "Forged"}),
+                                content_type="text/plain")
+        self.assertEqual(response.status_code, 415)
+        self.assertTrue(Task.objects.filter(id=self.task.id, title="Existing task").exists())
+
+        response = client.post(reverse("api_task_batch"), data=body, content_type="application/json; charset=utf-8")
+        self.assertEqual(response.status_code, 200)
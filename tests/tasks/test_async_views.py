@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+
+from tasks import async_views
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+class AsyncViewsTests(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.task = Task.objects.create(title="Existing task", complete=False)
+
+    @tc("TC031")
+    async def test_index_lists_and_creates(self):
+        response = await async_views.index(self.factory.get("/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Existing task", response.content)
+        self.assertIn("ETag", response)
+
+        response = await async_views.index(self.factory.post("/?status=open", {"title": "Async task"}))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "/?status=open")
+        self.assertTrue(await Task.objects.filter(title="Async task").aexists())
+
+    @tc("TC031")
+    async def test_index_answers_conditional_get(self):
+        etag = (await async_views.index(self.factory.get("/")))["ETag"]
+        response = await async_views.index(self.factory.get("/", headers={"If-None-Match": etag}))
+        self.assertEqual(response.status_code, 304)
+
+    @tc("TC031")
+    async def test_update_and_delete(self):
+        url = f"/update_task/{self.task.id}/"
+        response = await async_views.updateTask(self.factory.get(url), pk=str(self.task.id))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+
+        request = self.factory.post(url, {"title": "Renamed", "complete": True})
+        response = await async_views.updateTask(request, pk=str(self.task.id))
+        self.assertEqual(response.status_code, 302)
+        await self.task.arefresh_from_db()
+        self.assertEqual(self.task.title, "Renamed")
+
+        request = self.factory.post(f"/delete_task/{self.task.id}/", headers={"HX-Request": "true"})
+        response = await async_views.deleteTask(request, pk=str(self.task.id))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(await Task.objects.filter(id=self.task.id).aexists())
+
+
+@override_settings(SQLITE_LOCK_RETRIES=3, SQLITE_LOCK_BACKOFF=0)
+class AsyncViewsLockedTests(TransactionTestCase):
+    """Out of a transaction, as retry_on_locked never retries inside one."""
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.task = Task.objects.create(title="Existing task", complete=False)
+
+    def locked_once(self, method):
+        real = getattr(Task, method)
+        calls = []
+
+        def fake(task, *args, **kwargs):
+            calls.append(task)
+            if len(calls) == 1:
+                raise OperationalError("database is locked")
+            return real(task, *args, **kwargs)
+
+        patcher = mock.patch.object(Task, method, fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return calls
+
+    @tc("TC031")
+    async def test_create_is_retried_when_the_database_is_locked(self):
+        calls = self.locked_once("save")
+        response = await async_views.index(self.factory.post("/", {"title": "Async task"}))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(await Task.objects.filter(title="Async task").aexists())
+
+    @tc("TC031")
+    async def test_update_is_retried_when_the_database_is_locked(self):
+        calls = self.locked_once("save")
+        request = self.factory.post(f"/update_task/{self.task.id}/", {"title": "Renamed", "complete": True})
+        response = await async_views.updateTask(request, pk=str(self.task.id))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(calls), 2)
+        await self.task.arefresh_from_db()
+        self.assertEqual(self.task.title, "Renamed")
+
+    @tc("TC031")
+    async def test_delete_is_retried_when_the_database_is_locked(self):
+        calls = self.locked_once("delete")
+        request = self.factory.post(f"/delete_task/{self.task.id}/", headers={"HX-Request": "true"})
+        response = await async_views.deleteTask(request, pk=str(self.task.id))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(await Task.objects.filter(id=self.task.id).aexists())
@@ -0,0 +1,50 @@
+from django.test import TestCase
+
+from tasks import bench
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+class BenchTests(TestCase):
+    @tc("TC038")
+    def test_client_scenarios_report_latency_and_queries(self):
+        bench.seed(30)
+        self.assertEqual(Task.objects.count(), 30)
+
+        scenarios = bench.build_scenarios(requests=5)
+        self.assertEqual(tuple(scenario.name for scenario in scenarios), bench.SCENARIOS)
+        results = [bench.run_client(scenario, 5) for scenario in scenarios]
+
+        for result in results:
+            self.assertEqual(result["requests"], 5)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertLessEqual(result["p95_ms"], result["p99_ms"])
+            self.assertGreater(result["throughput_rps"], 0)
+        by_id = {result["bench_id"]: result for result in results}
+        self.assertGreater(by_id["create:client"]["queries_per_request"], 0)
+        # Reads repeat the same pages between writes: the cache serves them.
+        self.assertGreater(by_id["list:client"]["cache_hit_ratio"], 0)
+        # Every task reserved for the delete scenario was deleted.
+        self.assertFalse(Task.objects.filter(title__startswith="Bench delete").exists())
+
+    @tc("TC038")
+    def test_compare_flags_regressions_against_baseline(self):
+        baseline = {"benchmarks": [{
+            "bench_id": "list:client", "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 4.0,
+            "throughput_rps": 500.0, "queries_per_request": 1.0,
+        }]}
+        within = {"bench_id": "list:client", "p50_ms": 1.2, "p95_ms": 2.4, "p99_ms": 4.0,
+                  "throughput_rps": 420.0, "queries_per_request": 1.0}
+        slower = dict(within, p95_ms=3.0, queries_per_request=2.0)
+        added = dict(within, bench_id="search:client")
+
+        self.assertEqual(bench.compare([within, added], baseline), [])
+        self.assertEqual((within["status"], added["status"]), ("passed", "new"))
+
+        regressions = bench.compare([slower], baseline, tolerance=0.25)
+        self.assertEqual(slower["status"], "regressed")
+        self.assertEqual(regressions, [
+            "list:client: p95_ms 3.0 > 2.0",
+            "list:client: queries_per_request 2.0 > 1.0",
+        ])
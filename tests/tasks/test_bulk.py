@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks.bulk import apply_bulk_action, iter_pk_chunks
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+class BulkActionTests(TestCase):
+    def setUp(self):
+        self.tasks = [Task.objects.create(title=f"Task {i}", complete=i % 2 == 1) for i in range(6)]
+
+    def patch(self, target):
+        patcher = mock.patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    @tc("TC029")
+    def test_pk_chunks_are_bounded(self):
+        chunks = list(iter_pk_chunks(Task.objects.all(), chunk_size=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 2])
+
+    @tc("TC029")
+    def test_delete_bumps_the_cache_once_per_chunk(self):
+        Task.objects.bulk_create(Task(title=f"More {i}") for i in range(494))
+        per_task = self.patch("tasks.signals.bump_version")
+        per_chunk = self.patch("tasks.bulk.bump_version")
+        refresh = self.patch("tasks.bulk.publish_refresh")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(apply_bulk_action(Task.objects.all(), "delete", chunk_size=250), 500)
+
+        per_task.assert_not_called()
+        # Once in each chunk's transaction and once after its commit.
+        self.assertEqual(per_chunk.call_count, 4)
+        self.assertEqual(refresh.call_count, 2)
+        self.assertFalse(Task.objects.exists())
+
+    @tc("TC029")
+    def test_complete_selected_tasks(self):
+        ids = [self.tasks[0].id, self.tasks[2].id]
+        response = self.client.post(reverse("bulk_tasks"), {"action": "complete", "ids": ids})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "/")
+        self.assertEqual(Task.objects.filter(id__in=ids, complete=True).count(), 2)
+        self.assertFalse(Task.objects.get(id=self.tasks[4].id).complete)
+
+    @tc("TC029")
+    def test_invalid_ids_are_ignored(self):
+        ids = ["²", "99999999999999999999999", "-1", "x", str(self.tasks[0].id)]
+        response = self.client.post(reverse("bulk_tasks"), {"action": "delete", "ids": ids})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Task.objects.count(), 5)
+        self.assertFalse(Task.objects.filter(id=self.tasks[0].id).exists())
+
+    @tc("TC029")
+    def test_delete_all_matching_filter(self):
+        response = self.client.post(
+            reverse("bulk_tasks") + "?status=done",
+            {"action": "delete", "scope": "filter"},
+        )
+
+        self.assertEqual(response["Location"], "/?status=done")
+        self.assertEqual(Task.objects.count(), 3)
+        self.assertFalse(Task.objects.filter(complete=True).exists())
+
+    @tc("TC029")
+    def test_delete_all_matching_keeps_the_search(self):
+        kept = Task.objects.create(title="Acheter du pain", complete=True)
+        Task.objects.create(title="Courses du samedi", complete=True)
+        Task.objects.create(title="Courses du dimanche", complete=False)
+
+        response = self.client.get(reverse("list"), {"status": "done", "q": "courses"})
+        self.assertContains(response, f'action="{reverse("bulk_tasks")}?status=done&amp;q=courses"')
+
+        response = self.client.post(
+            reverse("bulk_tasks") + "?status=done&q=courses",
+            {"action": "delete", "scope": "filter"},
+        )
+
+        self.assertEqual(response["Location"], "/?status=done&q=courses")
+        self.assertEqual(list(Task.objects.filter(title__startswith="Courses").values_list("title", flat=True)),
+                         ["Courses du dimanche"])
+        self.assertTrue(Task.objects.filter(pk=kept.pk).exists())
+        self.assertEqual(Task.objects.filter(title__startswith="Task").count(), 6)
+
+    @tc("TC029")
+    def test_reopen_in_chunks_counts_only_changed_rows(self):
+        self.assertEqual(apply_bulk_action(Task.objects.all(), "reopen", chunk_size=2), 3)
+        self.assertFalse(Task.objects.filter(complete=True).exists())
+
+    @tc("TC029")
+    def test_unknown_action_is_rejected(self):
+        response = self.client.post(reverse("bulk_tasks"), {"action": "explode", "scope": "filter"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Task.objects.count(), 6)
@@ -0,0 +1,61 @@
+import tempfile
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.cache import cache_stats, get_version, reset_cache_stats
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+class TaskListCacheTests(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(title="Cached task", complete=False)
+        reset_cache_stats()
+
+    @tc("TC026")
+    def test_second_get_is_served_from_cache_without_queries(self):
+        self.client.get(reverse("list"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("list"))
+
+        self.assertContains(response, "Cached task")
+        self.assertEqual(cache_stats()["hits"], 1)
+        self.assertEqual(cache_stats()["misses"], 1)
+        self.assertEqual(cache_stats()["hit_ratio"], 0.5)
+
+    @tc("TC026")
+    def test_save_and_delete_invalidate_fragment(self):
+        self.client.get(reverse("list"))
+        version = get_version()
+
+        self.task.title = "Renamed task"
+        self.task.save()
+        self.assertGreater(get_version(), version)
+        self.assertContains(self.client.get(reverse("list")), "Renamed task")
+
+        self.task.delete()
+        self.assertNotContains(self.client.get(reverse("list")), "Renamed task")
+        self.assertEqual(cache_stats()["hits"], 0)
+
+    @tc("TC026")
+    @override_settings(TASKS_LIST_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        self.client.get(reverse("list"))
+        self.client.get(reverse("list"))
+        self.assertEqual(cache_stats()["hits"] + cache_stats()["misses"], 0)
+
+    @tc("TC026")
+    def test_works_with_file_based_cache(self):
+        location = tempfile.mkdtemp()
+        backend = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}
+        with override_settings(CACHES={"default": backend}):
+            try:
+                self.client.get(reverse("list"))
+                self.assertContains(self.client.get(reverse("list")), "Cached task")
+                self.assertEqual(cache_stats()["hits"], 1)
+            finally:
+                caches["default"].clear()
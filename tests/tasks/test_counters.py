@@ -0,0 +1,88 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks.bulk import apply_bulk_action
+from tasks.counters import task_counts
+from tasks.models import Task, TaskCounter
+
+from ..decorators import tc
+
+
+class TaskCounterTests(TestCase):
+    def assertCountersConsistent(self):
+        self.assertEqual(task_counts(), {
+            "open": Task.objects.filter(complete=False).count(),
+            "done": Task.objects.filter(complete=True).count(),
+        })
+
+    @tc("TC037")
+    def test_counters_follow_every_write_path(self):
+        task = Task.objects.create(title="Created")
+        Task.objects.bulk_create(Task(title=f"Bulk {i}", complete=i % 2 == 0) for i in range(6))
+        self.assertEqual(task_counts(), {"open": 4, "done": 3})
+
+        task.complete = True
+        task.save()
+        task.save()
+        self.assertCountersConsistent()
+
+        Task.objects.filter(title__startswith="Bulk").update(complete=True)
+        self.assertCountersConsistent()
+        apply_bulk_action(Task.objects.all(), "reopen", chunk_size=4)
+        self.assertCountersConsistent()
+
+        response = self.client.post(
+            reverse("api_task_batch"),
+            data=json.dumps({"create": [{"title": "API", "complete": True}], "delete": [task.pk]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersConsistent()
+
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False)
+        json.dump([{"title": "Imported", "complete": True}, {"title": "Imported too"}], tmp)
+        tmp.close()
+        call_command("import_dataset", path=tmp.name, stdout=io.StringIO())
+        self.assertCountersConsistent()
+        call_command("import_dataset", path=tmp.name, truncate=True, stdout=io.StringIO())
+        Path(tmp.name).unlink()
+        self.assertEqual(task_counts(), {"open": 1, "done": 1})
+
+        apply_bulk_action(Task.objects.all(), "delete")
+        self.assertEqual(task_counts(), {"open": 0, "done": 0})
+
+    @tc("TC037")
+    def test_recount_repairs_drift(self):
+        Task.objects.create(title="Open")
+        TaskCounter.objects.filter(complete=False).update(count=42)
+        TaskCounter.objects.filter(complete=True).delete()
+
+        with self.assertRaises(CommandError):
+            call_command("recount_tasks", check=True, stdout=io.StringIO())
+
+        out = io.StringIO()
+        call_command("recount_tasks", stdout=out)
+        self.assertIn("42 open / 0 done -> 1 open / 0 done", out.getvalue())
+        call_command("recount_tasks", check=True, stdout=io.StringIO())
+
+        # A missing counter row is recreated by the triggers.
+        TaskCounter.objects.filter(complete=True).delete()
+        Task.objects.create(title="Done", complete=True)
+        self.assertCountersConsistent()
+
+    @tc("TC037")
+    def test_list_header_and_admin_show_counts(self):
+        Task.objects.create(title="Open")
+        Task.objects.create(title="Done", complete=True)
+        self.assertContains(self.client.get(reverse("list")), "1 open / 1 done")
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "password"))
+        self.assertContains(self.client.get(reverse("admin:tasks_task_changelist")), "1 open / 1 done")
@@ -0,0 +1,67 @@
+import csv
+import gzip
+import io
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+class ExportDatasetTests(TestCase):
+    def setUp(self):
+        self.old = Task.objects.create(title="Old task", complete=True)
+        Task.objects.filter(pk=self.old.pk).update(created=timezone.now() - timedelta(days=10))
+        self.new = Task.objects.create(title="Nouvelle tâche", complete=False)
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def _export(self, **options):
+        out = io.StringIO()
+        call_command("export_dataset", stdout=out, **options)
+        return out.getvalue()
+
+    @tc("TC024")
+    def test_export_json_round_trips_through_import(self):
+        path = self.tmpdir / "export.json"
+        self._export(path=str(path))
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual([entry["title"] for entry in data], ["Old task", "Nouvelle tâche"])
+        self.assertIn("created", data[0])
+
+        call_command("import_dataset", path=str(path), truncate=True, stdout=io.StringIO())
+        self.assertEqual(
+            sorted(Task.objects.values_list("title", "complete")),
+            [("Nouvelle tâche", False), ("Old task", True)],
+        )
+
+    @tc("TC024")
+    def test_export_ndjson_to_stdout_with_since(self):
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        output = self._export(format="ndjson", since=since)
+
+        lines = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([entry["title"] for entry in lines], ["Nouvelle tâche"])
+
+    @tc("TC024")
+    def test_export_gzip_csv(self):
+        path = self.tmpdir / "export.csv.gz"
+        self._export(path=str(path), chunk_size=1)
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["title", "complete", "created"])
+        self.assertEqual([row[0] for row in rows[1:]], ["Old task", "Nouvelle tâche"])
+
+    @tc("TC024")
+    def test_export_invalid_since_raises_error(self):
+        with self.assertRaises(CommandError):
+            self._export(since="yesterday")
@@ -1,11 +1,15 @@
+import io
 import json
 import tempfile
+from concurrent.futures import Future
 from pathlib import Path
+from unittest import mock
 
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from django.test import TestCase
 
+from tasks.dataset import JSON, Shard, iter_json_array, iter_parsed, parse_shard, split_ndjson
 from tasks.models import Task
 
 from ..decorators import tc
@@ -24,6 +28,16 @@ class ImportDatasetTests(TestCase):
         tmp.close()
         return path
 
+    def _write_temp_ndjson(self, objs) -> Path:
+        """Same as `_write_temp_json`, one object per line."""
+        tmp = tempfile.NamedTemporaryFile(mode="w+", suffix=".ndjson", delete=False)
+        path = Path(tmp.name)
+        for obj in objs:
+            tmp.write(json.dumps(obj) + "\n")
+        tmp.flush()
+        tmp.close()
+        return path
+
     @tc("TC016")
     def test_import_dataset_creates_tasks_from_file_with_truncate(self):
         data = [
@@ -42,6 +56,20 @@ class ImportDatasetTests(TestCase):
         self.assertIn("Task B", titles)
         self.assertFalse(Task.objects.filter(title="OLD").exists())
 
+    @tc("TC016")
+    def test_import_dataset_truncate_keeps_tasks_when_the_file_is_malformed(self):
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False)
+        tmp.write('[{"title": "new 1"}, {"title": oops}]')
+        tmp.close()
+        Task.objects.create(title="OLD", complete=False)
+
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command("import_dataset", path=tmp.name, truncate=True, stdout=out)
+
+        self.assertEqual(list(Task.objects.values_list("title", flat=True)), ["OLD"])
+        self.assertNotIn("Deleted", out.getvalue())
+
     @tc("TC017")
     def test_import_dataset_appends_tasks_without_truncate(self):
         existing = Task.objects.create(title="Existing", complete=False)
@@ -89,3 +117,94 @@ class ImportDatasetTests(TestCase):
         task = Task.objects.get()
         self.assertEqual(task.title, "Valid task")
         self.assertFalse(Task.objects.filter(title="").exists())
+
+    @tc("TC022")
+    def test_json_array_is_parsed_incrementally(self):
+        """Items split across read chunks are reassembled."""
+        data = [{"title": f"Task {i}", "complete": i % 2 == 0, "n": 12345} for i in range(20)]
+        stream = io.StringIO(json.dumps(data, indent=2))
+
+        self.assertEqual(list(iter_json_array(stream, chunk_size=7)), data)
+
+    @tc("TC022")
+    def test_import_dataset_ndjson_in_batches(self):
+        data = [{"title": f"Task {i}", "complete": False} for i in range(5)]
+        data.insert(2, {"complete": True})
+        path = self._write_temp_ndjson(data)
+
+        out = io.StringIO()
+        call_command("import_dataset", path=str(path), batch_size=2, stdout=out, stderr=io.StringIO())
+
+        self.assertEqual(Task.objects.count(), 5)
+        self.assertIn("Imported 5 task(s)", out.getvalue())
+        self.assertIn("skipped 1", out.getvalue())
+
+    @tc("TC022")
+    def test_import_dataset_rejects_invalid_batch_size(self):
+        path = self._write_temp_json([{"title": "Task"}])
+
+        with self.assertRaises(CommandError):
+            call_command("import_dataset", path=str(path), batch_size=0)
+
+    @tc("TC023")
+    def test_split_ndjson_shards_cover_every_line_once(self):
+        data = [{"title": f"Task {i}", "complete": i % 3 == 0} for i in range(50)]
+        path = self._write_temp_ndjson(data)
+
+        shards = split_ndjson(path, parts=6, min_shard_bytes=64)
+
+        self.assertGreater(len(shards), 1)
+        parsed = [cleaned for shard in shards for cleaned, _ in parse_shard(shard)]
+        self.assertEqual(parsed, [(entry["title"], entry["complete"]) for entry in data])
+
+    @tc("TC023")
+    def test_import_dataset_parallel_matches_serial(self):
+        data = [{"title": f"Task {i}", "complete": i % 2 == 0} for i in range(30)]
+        data.insert(10, {"complete": True})
+        paths = [self._write_temp_ndjson(data[:15]), self._write_temp_json(data[15:])]
+
+        out = io.StringIO()
+        call_command("import_dataset", *map(str, paths), workers=2, batch_size=7, stdout=out, stderr=io.StringIO())
+
+        self.assertIn("Imported 30 task(s) from 2 files", out.getvalue())
+        self.assertIn("skipped 1", out.getvalue())
+        self.assertEqual(
+            list(Task.objects.order_by("id").values_list("title", "complete")),
+            [(entry["title"], entry["complete"]) for entry in data if "title" in entry],
+        )
+
+    @tc("TC023")
+    def test_json_arrays_are_streamed_by_the_importing_process(self):
+        data = [{"title": f"Task {i}", "complete": False} for i in range(20)]
+        ndjson, array = self._write_temp_ndjson(data[:10]), self._write_temp_json(data[10:])
+        submitted = []
+
+        class InlinePool:
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def submit(self, fn, shard):
+                submitted.append(shard)
+                future = Future()
+                future.set_result(fn(shard))
+                return future
+
+        shards = [*split_ndjson(ndjson, parts=3, min_shard_bytes=64), Shard(str(array), JSON)]
+        with mock.patch("tasks.dataset.ProcessPoolExecutor", InlinePool), \
+                mock.patch("tasks.dataset.multiprocessing.current_process") as current_process:
+            current_process.return_value.daemon = False
+            parsed = [cleaned for cleaned, _ in iter_parsed(shards, workers=2)]
+
+        self.assertEqual(parsed, [(entry["title"], False) for entry in data])
+        self.assertEqual(submitted, shards[:-1])
+
+    @tc("TC023")
+    def test_import_dataset_glob_without_match_raises_error(self):
+        with self.assertRaises(CommandError):
+            call_command("import_dataset", "does_not_exist_*.ndjson")
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from tasks.db import configure_sqlite, retry_on_locked
+
+from ..decorators import tc
+
+
+@override_settings(SQLITE_LOCK_RETRIES=3, SQLITE_LOCK_BACKOFF=0)
+class RetryOnLockedTests(SimpleTestCase):
+    @tc("TC032")
+    def test_locked_writes_are_retried(self):
+        write = mock.Mock(side_effect=[OperationalError("database is locked"), OperationalError("database is locked"), "ok"])
+
+        self.assertEqual(retry_on_locked(write)(), "ok")
+        self.assertEqual(write.call_count, 3)
+
+    @tc("TC032")
+    def test_gives_up_after_the_configured_retries(self):
+        write = mock.Mock(side_effect=OperationalError("database is locked"))
+
+        with self.assertRaises(OperationalError):
+            retry_on_locked(write)()
+        self.assertEqual(write.call_count, 4)
+
+    @tc("TC032")
+    def test_other_errors_are_not_retried(self):
+        write = mock.Mock(side_effect=OperationalError("no such table: tasks_task"))
+
+        with self.assertRaises(OperationalError):
+            retry_on_locked(write)()
+        self.assertEqual(write.call_count, 1)
+
+
+class SqlitePragmaTests(TestCase):
+    @tc("TC032")
+    @override_settings(SQLITE_PRAGMAS={"cache_size": -4096, "busy_timeout": 1234})
+    def test_configured_pragmas_are_applied(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        configure_sqlite(sender=None, connection=connection)
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -4096)
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 1234)
@@ -0,0 +1,129 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, override_settings
+
+from tasks import async_views, events
+from tasks.bulk import apply_bulk_action
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+class RecordingBroker(events.EventBroker):
+    def __init__(self):
+        self.events = []
+
+    def publish(self, event):
+        self.events.append(event)
+
+    def subscribe(self):
+        raise NotImplementedError("recording only")
+
+    def unsubscribe(self, queue):
+        pass
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    @tc("TC034")
+    async def test_fans_out_to_every_subscriber(self):
+        broker = events.InProcessBroker()
+        first, second = broker.subscribe(), broker.subscribe()
+        broker.publish({"type": "deleted", "id": 3})
+        self.assertEqual((await first.get())["id"], 3)
+        self.assertEqual((await second.get())["type"], "deleted")
+
+        broker.unsubscribe(first)
+        self.assertEqual(broker.subscriber_count, 1)
+        self.assertTrue(broker.has_subscribers())
+
+    @tc("TC034")
+    def test_brokers_must_implement_the_whole_interface(self):
+        class PublishOnly(events.EventBroker):
+            def publish(self, event):
+                pass
+
+        with self.assertRaises(TypeError):
+            PublishOnly()
+
+    @tc("TC034")
+    async def test_slow_subscriber_is_told_to_refresh(self):
+        broker = events.InProcessBroker(queue_size=2)
+        queue = broker.subscribe()
+        for pk in range(3):
+            broker.publish({"type": "deleted", "id": pk})
+        # The overflowing event replaces the backlog with a single refresh.
+        self.assertEqual((await queue.get())["type"], "refresh")
+        self.assertTrue(queue.empty())
+
+
+@override_settings(TASKS_EVENT_BROKER="tests.tasks.test_events.RecordingBroker")
+class TaskEventPublishingTests(TestCase):
+    def setUp(self):
+        events.reset_broker()
+
+    @tc("TC034")
+    def test_writes_publish_after_commit(self):
+        broker = events.get_broker()
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(title="Live task")
+        with self.captureOnCommitCallbacks(execute=True):
+            task.complete = True
+            task.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+
+        self.assertEqual([event["type"] for event in broker.events], ["created", "updated", "deleted"])
+        self.assertIn('id="task-', broker.events[0]["html"])
+        self.assertTrue(broker.events[1]["complete"])
+        self.assertNotIn("html", broker.events[2])
+
+    @tc("TC034")
+    @override_settings(TASKS_EVENT_BROKER="tasks.events.InProcessBroker")
+    def test_nothing_is_rendered_without_subscribers(self):
+        with mock.patch("django.template.loader.render_to_string") as render, \
+                mock.patch.object(events.InProcessBroker, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                task = Task.objects.create(title="Unwatched task")
+            with self.captureOnCommitCallbacks(execute=True):
+                apply_bulk_action(Task.objects.filter(pk=task.pk), "complete")
+
+        render.assert_not_called()
+        publish.assert_not_called()
+
+    @tc("TC034")
+    def test_bulk_update_publishes_refresh(self):
+        broker = events.get_broker()
+        Task.objects.create(title="Bulk task")
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_bulk_action(Task.objects.all(), "complete")
+        self.assertEqual(broker.events[-1], {"type": "refresh"})
+
+
+class TaskEventsViewTests(TestCase):
+    @tc("TC034")
+    async def test_streams_published_events(self):
+        broker = events.InProcessBroker()
+        with mock.patch.object(async_views, "get_broker", return_value=broker):
+            response = await async_views.taskEvents(AsyncRequestFactory().get("/events/"))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+
+        broker.publish({"type": "deleted", "id": 7})
+        message = (await anext(stream)).decode()
+        self.assertTrue(message.startswith("id: 1\nevent: deleted\ndata: "))
+        self.assertIn('"id": 7', message)
+
+        response.close()
+        self.assertEqual(broker.subscriber_count, 0)
+
+    @tc("TC034")
+    def test_wsgi_requests_are_refused(self):
+        response = self.client.get("/events/")
+        self.assertEqual(response.status_code, 501)
+
+    @tc("TC034")
+    async def test_list_page_loads_live_updates_under_asgi_only(self):
+        self.assertContains(await self.async_client.get("/"), "live-updates")
+        self.assertNotContains(await sync_to_async(self.client.get)("/"), "live-updates")
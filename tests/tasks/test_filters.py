@@ -0,0 +1,46 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks.filters import filter_by_status, get_status, list_url
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+class StatusFilterTests(TestCase):
+    def setUp(self):
+        self.open_task = Task.objects.create(title="Open task", complete=False)
+        self.done_task = Task.objects.create(title="Done task", complete=True)
+
+    @tc("TC021")
+    def test_get_status_falls_back_to_all(self):
+        self.assertEqual(get_status({"status": "open"}), "open")
+        self.assertEqual(get_status({"status": "bogus"}), "all")
+        self.assertEqual(get_status({}), "all")
+
+    @tc("TC021")
+    def test_filter_by_status(self):
+        self.assertEqual(list(filter_by_status(Task.objects.all(), "open")), [self.open_task])
+        self.assertEqual(list(filter_by_status(Task.objects.all(), "done")), [self.done_task])
+        self.assertEqual(filter_by_status(Task.objects.all(), "all").count(), 2)
+
+    @tc("TC021")
+    def test_index_only_lists_matching_tasks(self):
+        response = self.client.get(reverse("list"), {"status": "open"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["status"], "open")
+        self.assertEqual(list(response.context["tasks"]), [self.open_task])
+
+    @tc("TC021")
+    def test_redirects_keep_status(self):
+        response = self.client.post(reverse("list") + "?status=done", data={"title": "New"})
+        self.assertEqual(response["Location"], list_url("done"))
+
+        url = reverse("update_task", args=[self.open_task.id]) + "?status=open"
+        response = self.client.post(url, data={"title": "Renamed", "complete": False})
+        self.assertEqual(response["Location"], "/?status=open")
+
+        url = reverse("delete_task", args=[self.done_task.id]) + "?status=done"
+        response = self.client.post(url)
+        self.assertEqual(response["Location"], "/?status=done")
@@ -0,0 +1,143 @@
+import datetime
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.bulk import apply_bulk_action
+from tasks.models import Task, TaskChange
+
+from ..decorators import tc
+
+# pg_advisory_xact_lock() taken before each journal write on PostgreSQL.
+JOURNAL_LOCK_QUERIES = 1 if connection.vendor == "postgresql" else 0
+
+
+def journal():
+    return list(TaskChange.objects.order_by("id").values_list("task_id", "action"))
+
+
+class TaskJournalTests(TestCase):
+    @tc("TC035")
+    def test_every_write_path_is_journaled(self):
+        task = Task.objects.create(title="Journaled")
+        task.complete = True
+        task.save()
+        other = Task.objects.create(title="Bulk")
+        apply_bulk_action(Task.objects.filter(pk=other.pk), "complete")
+        apply_bulk_action(Task.objects.all(), "delete")
+
+        entries = journal()
+        self.assertEqual(entries[:4], [
+            (task.pk, "created"),
+            (task.pk, "updated"),
+            (other.pk, "created"),
+            (other.pk, "updated"),
+        ])
+        self.assertCountEqual(entries[4:], [(task.pk, "deleted"), (other.pk, "deleted")])
+
+    @tc("TC035")
+    def test_bulk_delete_journals_in_one_query(self):
+        Task.objects.bulk_create(Task(title=f"Task {i}") for i in range(20))
+        # Chunk select, savepoint, journal insert, delete, release, last chunk select
+        # (plus the journal lock on PostgreSQL): no task is loaded.
+        with self.assertNumQueries(6 + JOURNAL_LOCK_QUERIES):
+            apply_bulk_action(Task.objects.all(), "delete", chunk_size=50)
+        self.assertEqual(TaskChange.objects.filter(action="deleted").count(), 20)
+
+    @tc("TC035")
+    def test_import_dataset_is_journaled(self):
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False)
+        json.dump([{"title": "Imported"}], tmp)
+        tmp.close()
+        call_command("import_dataset", path=tmp.name, stdout=io.StringIO())
+        Path(tmp.name).unlink()
+
+        task = Task.objects.get(title="Imported")
+        self.assertEqual(journal(), [(task.pk, "created")])
+
+    @tc("TC035")
+    def test_import_truncate_deletes_without_loading_tasks(self):
+        old = Task.objects.bulk_create(Task(title=f"Old {i}") for i in range(20))
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False)
+        json.dump([], tmp)
+        tmp.close()
+        self.addCleanup(Path(tmp.name).unlink)
+        # Savepoint, journal insert, delete, release (plus the journal lock on PostgreSQL):
+        # the same for any number of tasks.
+        with self.assertNumQueries(4 + JOURNAL_LOCK_QUERIES):
+            call_command("import_dataset", path=tmp.name, truncate=True, stdout=io.StringIO())
+
+        self.assertFalse(Task.objects.exists())
+        self.assertCountEqual(journal(), [(task.pk, "deleted") for task in old])
+
+
+class SyncEndpointTests(TestCase):
+    def sync(self, since=None):
+        params = {} if since is None else {"since": since}
+        return self.client.get(reverse("sync"), params)
+
+    @tc("TC035")
+    def test_returns_changes_after_cursor_with_tombstones(self):
+        kept = Task.objects.create(title="Kept")
+        gone = Task.objects.create(title="Gone")
+        gone_pk = gone.pk
+        body = self.sync().json()
+        self.assertEqual([change["task"]["title"] for change in body["changes"]], ["Kept", "Gone"])
+        cursor = body["cursor"]
+
+        kept.title = "Renamed"
+        kept.save()
+        kept.save()
+        gone.delete()
+        body = self.sync(cursor).json()
+        # Several changes of one task fold into its latest state.
+        self.assertEqual(body["changes"], [
+            {"id": kept.pk, "deleted": False, "task": self.sync().json()["changes"][0]["task"]},
+            {"id": gone_pk, "deleted": True},
+        ])
+        self.assertEqual(body["changes"][0]["task"]["title"], "Renamed")
+        self.assertFalse(body["has_more"])
+
+        self.assertEqual(self.sync(body["cursor"]).json()["changes"], [])
+        for since in ("nope", "-5", str(2 ** 63)):
+            with self.subTest(since=since):
+                self.assertEqual(self.sync(since).status_code, 400)
+
+    @tc("TC035")
+    @override_settings(TASKS_SYNC_PAGE_SIZE=2)
+    def test_pages_through_the_journal(self):
+        for i in range(5):
+            Task.objects.create(title=f"Task {i}")
+        titles, cursor, has_more = [], 0, True
+        while has_more:
+            body = self.sync(cursor).json()
+            titles += [change["task"]["title"] for change in body["changes"]]
+            cursor, has_more = body["cursor"], body["has_more"]
+        self.assertEqual(titles, [f"Task {i}" for i in range(5)])
+
+    @tc("TC035")
+    def test_compaction_bounds_journal_and_expires_old_cursors(self):
+        task = Task.objects.create(title="Edited")
+        for _ in range(3):
+            task.save()
+        doomed = Task.objects.create(title="Deleted long ago")
+        doomed_pk = doomed.pk
+        doomed.delete()
+        TaskChange.objects.filter(action="deleted").update(at=timezone.now() - datetime.timedelta(days=40))
+
+        out = io.StringIO()
+        call_command("compact_journal", days=30, stdout=out)
+        self.assertIn("Removed 4 journal entries", out.getvalue())
+        self.assertEqual(journal(), [(task.pk, "updated"), (doomed_pk, "compacted")])
+
+        self.assertEqual(self.sync(0).status_code, 410)
+        horizon = TaskChange.objects.get(action="compacted").pk
+        body = self.sync(horizon).json()
+        self.assertEqual(body["changes"], [])
@@ -0,0 +1,151 @@
+import re
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from tasks import profiling
+from tasks.cache import cache_stats, reset_cache_stats
+from tasks.metrics import LATENCY_BUCKETS, MetricsRegistry, registry
+from tasks.models import Task
+
+from ..decorators import tc
+
+
+def sample(text, metric, /, **labels):
+    """Value of the `metric` sample whose labels include `labels`, or None."""
+    for line in text.splitlines():
+        match = re.fullmatch(r"(\w+)(?:\{(.*)\})? (\S+)", line)
+        if match and match[1] == metric:
+            found = dict(re.findall(r'(\w+)="([^"]*)"', match[2] or ""))
+            if all(found.get(key) == str(value) for key, value in labels.items()):
+                return float(match[3])
+    return None
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        Task.objects.create(title="Measured")
+
+    @tc("TC039")
+    def test_requests_are_recorded_per_url_name(self):
+        self.client.get(reverse("list"))
+        self.client.get(reverse("list"))
+        task = Task.objects.get()
+        self.client.post(reverse("update_task", args=[task.pk]), {"title": "Renamed"})
+        self.client.get(reverse("delete_task", args=[task.pk]))
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        text = response.content.decode()
+
+        self.assertEqual(sample(text, "todo_http_request_duration_seconds_count", view="list", method="GET"), 2)
+        self.assertEqual(
+            sample(text, "todo_http_request_duration_seconds_bucket", view="list", method="GET", le="+Inf"), 2
+        )
+        self.assertEqual(sample(text, "todo_http_requests_total", view="list", method="GET", status=200), 2)
+        self.assertEqual(sample(text, "todo_http_requests_total", view="update_task", method="POST", status=302), 1)
+        self.assertEqual(sample(text, "todo_http_requests_total", view="delete_task", method="GET", status=200), 1)
+        self.assertGreater(sample(text, "todo_db_queries_total", view="list", method="GET"), 0)
+        self.assertGreater(sample(text, "todo_db_query_duration_seconds_total", view="list", method="GET"), 0)
+        self.assertGreater(sample(text, "todo_http_response_size_bytes_total", view="list", method="GET"), 0)
+
+    @tc("TC039")
+    def test_list_cache_hits_and_misses_are_exported(self):
+        reset_cache_stats()
+        self.client.get(reverse("list"))
+        self.client.get(reverse("list"))
+
+        text = self.client.get(reverse("metrics")).content.decode()
+        stats = cache_stats()
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["misses"], 0)
+        self.assertEqual(sample(text, "todo_list_cache_hits_total"), stats["hits"])
+        self.assertEqual(sample(text, "todo_list_cache_misses_total"), stats["misses"])
+        self.assertIn("# TYPE todo_list_cache_hits_total counter", text)
+
+    @tc("TC039")
+    def test_admin_and_unresolved_requests_are_grouped(self):
+        User.objects.create_superuser("admin", "admin@example.com", "secret")
+        self.client.login(username="admin", password="secret")
+        self.client.get(reverse("admin:index"))
+        self.client.get(reverse("admin:tasks_task_changelist"))
+        self.client.get("/no/such/page/")
+
+        text = registry.render()
+        self.assertEqual(sample(text, "todo_http_request_duration_seconds_count", view="admin", method="GET"), 2)
+        self.assertEqual(sample(text, "todo_http_requests_total", view="unresolved", status=404), 1)
+
+    @tc("TC039")
+    async def test_requests_are_recorded_under_asgi(self):
+        await self.async_client.get(reverse("list"))
+
+        text = registry.render()
+        self.assertEqual(sample(text, "todo_http_requests_total", view="list", method="GET", status=200), 1)
+        self.assertGreater(sample(text, "todo_db_queries_total", view="list", method="GET"), 0)
+
+    @tc("TC039")
+    def test_histogram_buckets_are_cumulative(self):
+        metrics = MetricsRegistry()
+        for seconds in (0.001, 0.02, 0.02, 0.3, 60):
+            metrics.observe_request("list", "GET", 200, seconds)
+        text = metrics.render()
+
+        counts = [
+            sample(text, "todo_http_request_duration_seconds_bucket", view="list", le=bound)
+            for bound in (*LATENCY_BUCKETS, "+Inf")
+        ]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(sample(text, "todo_http_request_duration_seconds_bucket", view="list", le=0.005), 1)
+        self.assertEqual(sample(text, "todo_http_request_duration_seconds_bucket", view="list", le=0.025), 3)
+        self.assertEqual(sample(text, "todo_http_request_duration_seconds_bucket", view="list", le=10.0), 4)
+        self.assertEqual(sample(text, "todo_http_request_duration_seconds_bucket", view="list", le="+Inf"), 5)
+        self.assertAlmostEqual(sample(text, "todo_http_request_duration_seconds_sum", view="list"), 60.341)
+
+
+class TemplateProfilingTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(profiling.uninstall)
+        for i in range(3):
+            Task.objects.create(title=f"Row {i}")
+
+    @tc("TC040")
+    def test_sampled_requests_time_templates_includes_and_url_tags(self):
+        with self.settings(TASKS_TEMPLATE_PROFILE_RATE=1.0, DEBUG=True):
+            response = self.client.get(reverse("list"))
+
+        header = response["Server-Timing"]
+        self.assertIn('template;dur=', header)
+        self.assertIn('desc="tasks/list.html x1"', header)
+        self.assertIn('desc="tasks/task_row.html x3"', header)
+        self.assertIn('desc="tasks/task_rows.html:3 x3"', header)
+        self.assertIn('desc="update_task x3"', header)
+
+        text = registry.render()
+        self.assertEqual(sample(text, "todo_template_profiled_requests_total", view="list"), 1)
+        self.assertEqual(sample(text, "todo_template_renders_total", kind="template", name="tasks/list.html"), 1)
+        self.assertEqual(sample(text, "todo_template_renders_total", kind="include", name="tasks/task_rows.html:3"), 3)
+        self.assertEqual(sample(text, "todo_template_renders_total", kind="url", name="delete_task"), 3)
+        self.assertGreater(sample(text, "todo_template_render_seconds_total", kind="template", name="tasks/list.html"), 0)
+
+    @tc("TC040")
+    def test_profiling_is_off_by_default_and_header_needs_debug(self):
+        self.client.get(reverse("list"))
+        self.assertIsNone(sample(registry.render(), "todo_template_profiled_requests_total", view="list"))
+
+        # The middleware reads the rate when the client's handler is built.
+        with self.settings(TASKS_TEMPLATE_PROFILE_RATE=1.0):
+            response = Client().get(reverse("list"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(sample(registry.render(), "todo_template_profiled_requests_total", view="list"), 1)
+
+    @tc("TC040")
+    def test_unsampled_requests_are_not_timed(self):
+        profiling.install()
+        with profiling.sample(0.0) as profile:
+            self.assertIsNone(profile)
+            self.client.get(reverse("list"))
+        self.assertIsNone(sample(registry.render(), "todo_template_renders_total", kind="template"))
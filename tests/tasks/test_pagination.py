@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.pagination import _page_query, decode_cursor, encode_cursor, paginate_keyset
+
+from ..decorators import tc
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.tasks = []
+        for i in range(5):
+            task = Task.objects.create(title=f"Task {i}", complete=False)
+            Task.objects.filter(pk=task.pk).update(created=now - timedelta(minutes=i))
+            task.refresh_from_db()
+            self.tasks.append(task)
+
+    @tc("TC020")
+    def test_cursor_round_trip(self):
+        task = self.tasks[2]
+        self.assertEqual(decode_cursor(encode_cursor(task)), (task.created, task.pk))
+        self.assertIsNone(decode_cursor("not-a-cursor"))
+
+    @tc("TC007")
+    def test_pages_walk_newest_first(self):
+        first = paginate_keyset(Task.objects.all(), page_size=2)
+        self.assertEqual(first.items, self.tasks[:2])
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+        second = paginate_keyset(Task.objects.all(), after=first.next_cursor, page_size=2)
+        self.assertEqual(second.items, self.tasks[2:4])
+        self.assertTrue(second.has_previous)
+
+        last = paginate_keyset(Task.objects.all(), after=second.next_cursor, page_size=2)
+        self.assertEqual(last.items, self.tasks[4:])
+        self.assertFalse(last.has_next)
+
+        back = paginate_keyset(Task.objects.all(), before=second.previous_cursor, page_size=2)
+        self.assertEqual(back.items, self.tasks[:2])
+        self.assertFalse(back.has_previous)
+
+    @tc("TC020")
+    def test_ties_on_created_are_broken_by_id(self):
+        Task.objects.update(created=self.tasks[0].created)
+        seen = []
+        page = paginate_keyset(Task.objects.all(), page_size=2)
+        while True:
+            seen.extend(task.pk for task in page)
+            if not page.has_next:
+                break
+            page = paginate_keyset(Task.objects.all(), after=page.next_cursor, page_size=2)
+        self.assertEqual(seen, sorted((task.pk for task in self.tasks), reverse=True))
+
+    @tc("TC020")
+    def test_cursor_pages_seek_the_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("The plan format checked here is SQLite's.")
+        key = (self.tasks[2].created, self.tasks[2].pk)
+        for queryset, index in [
+            (Task.objects.all(), "task_created_id_idx"),
+            (Task.objects.filter(complete=False), "task_open_created_id_idx"),
+        ]:
+            for after_key, before_key in [(key, None), (None, key)]:
+                qs, _ = _page_query(queryset, after_key, before_key, 2)
+                plan = qs.explain()
+                self.assertIn(f"SEARCH tasks_task USING INDEX {index} (created", plan)
+                self.assertNotIn("SCAN", plan)
+
+    @tc("TC020")
+    @override_settings(TASKS_PAGE_SIZE=2)
+    def test_index_renders_one_page_with_next_link(self):
+        response = self.client.get(reverse("list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["tasks"]), self.tasks[:2])
+        page = response.context["page"]
+        self.assertContains(response, f"?after={page.next_cursor}")
+
+        response = self.client.get(reverse("list"), {"after": page.next_cursor})
+        self.assertEqual(list(response.context["tasks"]), self.tasks[2:4])
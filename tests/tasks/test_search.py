@@ -0,0 +1,103 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.search import decode_cursor, encode_cursor, paginate_search, search_terms
+
+from ..decorators import tc
+
+
+def titles(page):
+    return [task.title for task in page]
+
+
+class TaskSearchTests(TestCase):
+    def setUp(self):
+        Task.objects.create(title="Faire les courses")
+        Task.objects.create(title="Réviser le cours d'économie avant les courses du samedi matin", complete=True)
+        Task.objects.create(title="Appeler l'école")
+
+    @tc("TC036")
+    def test_prefix_and_accent_insensitive_matching(self):
+        self.assertEqual(titles(paginate_search("ecole")), ["Appeler l'école"])
+        self.assertEqual(len(paginate_search("eco")), 2)
+        self.assertEqual(titles(paginate_search("ÉCO")), titles(paginate_search("eco")))
+        # Every term must match.
+        self.assertEqual(titles(paginate_search("cours samedi")), [
+            "Réviser le cours d'économie avant les courses du samedi matin",
+        ])
+
+    @tc("TC036")
+    def test_ranks_best_match_first_and_filters_by_status(self):
+        self.assertEqual(titles(paginate_search("courses")), [
+            "Faire les courses",
+            "Réviser le cours d'économie avant les courses du samedi matin",
+        ])
+        self.assertEqual(titles(paginate_search("courses", status="done")), [
+            "Réviser le cours d'économie avant les courses du samedi matin",
+        ])
+
+    @tc("TC036")
+    def test_index_follows_task_writes(self):
+        task = Task.objects.get(title="Faire les courses")
+        task.title = "Faire le plein"
+        task.save()
+        self.assertEqual(len(paginate_search("plein")), 1)
+        task.delete()
+        self.assertEqual(len(paginate_search("plein")), 0)
+        Task.objects.bulk_create([Task(title="Plein d'essence")])
+        self.assertEqual(titles(paginate_search("essence")), ["Plein d'essence"])
+
+    @tc("TC036")
+    def test_search_operators_are_plain_words(self):
+        self.assertEqual(search_terms('cours* AND "NOT" ; école'), ["cours", "and", "not", "école"])
+        self.assertEqual(len(paginate_search('"*')), 0)
+
+    @tc("TC036")
+    def test_results_paginate_with_cursors(self):
+        Task.objects.bulk_create(Task(title=f"Courses {i}") for i in range(5))
+        page = paginate_search("courses", page_size=3)
+        seen = titles(page)
+        while page.has_next:
+            page = paginate_search("courses", after=page.next_cursor, page_size=3)
+            seen += titles(page)
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+        back = paginate_search("courses", before=page.previous_cursor, page_size=3)
+        self.assertEqual(titles(back), seen[3:6])
+
+    @tc("TC036")
+    def test_out_of_range_cursors_are_ignored(self):
+        self.assertEqual(decode_cursor(encode_cursor(0.5, 12)), (0.5, 12))
+        for rank, pk in ((0.5, 99999999999999999999999), (0.5, -1), (float("nan"), 12), (float("inf"), 12)):
+            with self.subTest(rank=rank, pk=pk):
+                self.assertIsNone(decode_cursor(encode_cursor(rank, pk)))
+
+        token = encode_cursor(0.5, 99999999999999999999999)
+        response = self.client.get(reverse("list"), {"q": "courses", "after": token})
+        self.assertContains(response, "Faire les courses")
+
+    @tc("TC036")
+    @override_settings(TASKS_SEARCH_RANK_LIMIT=3)
+    def test_broad_searches_list_newest_first(self):
+        Task.objects.bulk_create(Task(title=f"Courses {i}") for i in range(5))
+        page = paginate_search("courses", page_size=4)
+        self.assertEqual(titles(page), ["Courses 4", "Courses 3", "Courses 2", "Courses 1"])
+        page = paginate_search("courses", after=page.next_cursor, page_size=4)
+        self.assertEqual(titles(page), [
+            "Courses 0",
+            "Réviser le cours d'économie avant les courses du samedi matin",
+            "Faire les courses",
+        ])
+        self.assertEqual(titles(paginate_search("courses", before=page.previous_cursor, page_size=4))[0], "Courses 4")
+
+    @tc("TC036")
+    def test_index_searches_with_q(self):
+        response = self.client.get(reverse("list"), {"q": "ecole"})
+        self.assertContains(response, "Appeler l&#x27;école")
+        self.assertNotContains(response, "Faire les courses")
+        self.assertContains(response, 'value="ecole"')
+
+        response = self.client.get(reverse("list"), {"q": "introuvable"})
+        self.assertContains(response, "No tasks match")
@@ -0,0 +1,142 @@
+import http.client
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from tasks.server import parse_bind
+
+from ..decorators import tc
+
+
+class ServeCommandTests(SimpleTestCase):
+    def serve(self, *args):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "todo.settings.serve",
+            "DJANGO_SECRET_KEY": "test-only",
+            "DATABASE_URL": f"sqlite:///{tmp.name}/db.sqlite3",
+            "DJANGO_CACHE_DIR": f"{tmp.name}/cache",
+        }
+        process = subprocess.Popen(
+            [sys.executable, "manage.py", "serve", "--bind", "127.0.0.1:0", "--graceful-timeout", "5", *args],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=settings.BASE_DIR, env=env,
+        )
+        self.addCleanup(self._kill, process)
+        lines = iter(process.stdout.readline, "")
+        line = next((line for line in lines if "Listening at" in line), "")
+        match = re.search(r"http://127\.0\.0\.1:(\d+) ", line)
+        self.assertIsNotNone(match, line)
+        return process, int(match.group(1))
+
+    def _kill(self, process):
+        if process.poll() is None:
+            process.kill()
+        process.communicate()
+
+    def stop(self, process):
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=20)
+        self.assertEqual(process.returncode, 0, output)
+        return output
+
+    def get(self, port, path="/metrics", method="GET", connection=None):
+        connection = connection or http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.request(method, path)
+        response = connection.getresponse()
+        return response, response.read().decode()
+
+    @tc("TC043")
+    def test_wsgi_workers_share_the_socket_and_stop_gracefully(self):
+        process, port = self.serve("--workers", "2")
+
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        for _ in range(3):
+            response, body = self.get(port, connection=connection)
+            self.assertEqual(response.status, 200)
+            self.assertIn("todo_http_requests_total", body)
+        self.assertEqual(self.get(port, "/missing")[0].status, 404)
+
+        output = self.stop(process)
+        self.assertIn("Handling signal: term", output)
+        self.assertIn("Shutting down: Master", output)
+
+    @tc("TC043")
+    def test_workers_are_recycled_after_max_requests(self):
+        process, port = self.serve("--workers", "1", "--max-requests", "2")
+
+        for _ in range(6):
+            response, body = self.get(port)
+            self.assertEqual(response.status, 200)
+        # /metrics is per worker: a worker which served them all would count 5.
+        served = re.search(r'todo_http_requests_total\{view="metrics",method="GET",status="200"\} (\d+)', body)
+        self.assertLess(int(served.group(1)) if served else 0, 5)
+        self.stop(process)
+
+    @tc("TC043")
+    def test_asgi_workers_keep_alive_and_stream(self):
+        process, port = self.serve("--workers", "2", "--interface", "asgi")
+
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        for _ in range(2):
+            response, body = self.get(port, connection=connection)
+            self.assertEqual(response.status, 200)
+            self.assertEqual(int(response.headers["content-length"]), len(body.encode()))
+            self.assertIn("todo_http_requests_total", body)
+        response, body = self.get(port, method="HEAD", connection=connection)
+        self.assertEqual((response.status, body), (200, ""))
+
+        # /events streams Server-Sent Events in chunks.
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as events:
+            events.sendall(b"GET /events/ HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            received = b""
+            while b"retry:" not in received:
+                received += events.recv(4096)
+            self.assertTrue(received.startswith(b"HTTP/1.1 200 OK\r\n"))
+            self.assertIn(b"transfer-encoding: chunked\r\n", received.lower())
+            self.assertIn(b"content-type: text/event-stream", received.lower())
+
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as bad:
+            bad.sendall(b"NOT HTTP\r\n\r\n")
+            self.assertTrue(bad.recv(4096).startswith(b"HTTP/1.1 400 Bad Request"))
+
+        self.stop(process)
+
+    @tc("TC043")
+    def test_hup_replaces_the_workers_gracefully(self):
+        process, port = self.serve("--workers", "2")
+        self.assertEqual(self.get(port)[0].status, 200)
+
+        process.send_signal(signal.SIGHUP)
+        lines = iter(process.stdout.readline, "")
+        next(line for line in lines if "Hang up: Master" in line)
+        next(line for line in lines if "Booting worker" in line)
+        for _ in range(4):
+            self.assertEqual(self.get(port)[0].status, 200)
+        self.stop(process)
+
+    @tc("TC043")
+    def test_several_workers_need_a_shared_cache(self):
+        result = subprocess.run(
+            [sys.executable, "manage.py", "serve", "--bind", "127.0.0.1:0", "--workers", "2"],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "todo.settings"},
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("--workers > 1 needs a cache shared between processes", result.stderr)
+
+    @tc("TC043")
+    def test_parse_bind(self):
+        self.assertEqual(parse_bind("0.0.0.0:8080"), ("0.0.0.0", 8080))
+        self.assertEqual(parse_bind("[::1]:8000"), ("::1", 8000))
+        self.assertEqual(parse_bind("9000"), ("127.0.0.1", 9000))
+        with self.assertRaises(ValueError):
+            parse_bind("localhost:http")
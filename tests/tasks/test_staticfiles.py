@@ -0,0 +1,81 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.staticfiles import IMMUTABLE, REVALIDATE, brotli
+
+from ..decorators import tc
+
+PRODUCTION_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "tasks.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+
+
+class StaticAssetsTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        settings = override_settings(STATIC_ROOT=self.root.name, STORAGES=PRODUCTION_STORAGES)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command("collectstatic", interactive=False, verbosity=0, ignore_patterns=["admin"])
+        self.css_url = staticfiles_storage.url("tasks/css/tasks.css")
+        self.css = (Path(self.root.name) / "tasks" / "css" / "tasks.css").read_bytes()
+
+    @tc("TC041")
+    def test_pages_link_hashed_local_assets_instead_of_inline_styles(self):
+        task = Task.objects.create(title="Styled")
+        self.assertRegex(self.css_url, r"^/static/tasks/css/tasks\.[0-9a-f]{12}\.css$")
+
+        for url in (reverse("list"), reverse("update_task", args=[task.pk]), reverse("delete_task", args=[task.pk])):
+            response = self.client.get(url)
+            self.assertContains(response, f'href="{self.css_url}"')
+            self.assertContains(response, staticfiles_storage.url("tasks/vendor/bootstrap/bootstrap.min.css"))
+            self.assertNotContains(response, "<style")
+            self.assertNotContains(response, "bootstrapcdn.com")
+        # Only loaded under ASGI, the only server streaming /events/.
+        self.assertContains(async_to_sync(self.async_client.get)(reverse("list")), staticfiles_storage.url("tasks/js/live-updates.js"))
+
+    @tc("TC041")
+    def test_hashed_assets_are_served_precompressed_and_immutable(self):
+        response = self.client.get(self.css_url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content), self.css)
+
+        response = self.client.get(self.css_url, HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, self.css)
+
+        response = self.client.get(self.css_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    @tc("TC041")
+    @unittest.skipIf(brotli is None, "brotli is not installed")
+    def test_brotli_is_preferred_when_accepted(self):
+        response = self.client.get(self.css_url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), self.css)
+
+    @tc("TC041")
+    def test_unhashed_and_missing_assets(self):
+        response = self.client.get("/static/tasks/css/tasks.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], REVALIDATE)
+
+        self.assertEqual(self.client.get("/static/tasks/css/missing.css").status_code, 404)
+        self.assertEqual(self.client.get("/static/../manage.py").status_code, 404)
+        self.assertEqual(self.client.get("/static/%2e%2e/manage.py").status_code, 404)
+        self.assertEqual(self.client.post(self.css_url).status_code, 405)
@@ -0,0 +1,57 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+
+from tasks.counters import recount, task_counts
+from tasks.models import Task
+from tasks.search import filter_by_search
+from tasks.triggers import check_triggers, missing_triggers
+
+from ..decorators import tc
+
+
+class TaskTriggersTests(TransactionTestCase):
+    """Out of a transaction: the SQLite schema editor refuses to run in one."""
+
+    def search(self, query):
+        return list(filter_by_search(Task.objects.all(), query).values_list("title", flat=True))
+
+    def actual_counts(self):
+        return {"open": Task.objects.filter(complete=False).count(), "done": Task.objects.filter(complete=True).count()}
+
+    def drop_triggers(self):
+        if connection.vendor == "sqlite":
+            # What Django does for most ALTER TABLE operations on SQLite.
+            with connection.schema_editor() as editor:
+                editor._remake_table(Task)
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("DROP TRIGGER tasks_taskcounter_upkeep ON tasks_task")
+
+    @tc("TC036")
+    def test_migrate_recreates_triggers_dropped_by_a_table_rebuild(self):
+        self.assertEqual(missing_triggers(connection), {})
+        # The flush between transactional tests does not go through the triggers.
+        recount()
+        Task.objects.create(title="Before")
+
+        self.drop_triggers()
+        self.assertNotEqual(missing_triggers(connection), {})
+        self.assertEqual([error.id for error in check_triggers(None, databases=["default"])], ["tasks.W001"])
+        # Written while the triggers are missing: the counters and the index miss it.
+        Task.objects.create(title="Café oublié", complete=True)
+        self.assertNotEqual(task_counts(), self.actual_counts())
+        if connection.vendor == "sqlite":
+            self.assertEqual(self.search("cafe"), [])
+
+        call_command("migrate", verbosity=0, stdout=io.StringIO(), stderr=io.StringIO())
+
+        self.assertEqual(missing_triggers(connection), {})
+        self.assertEqual(check_triggers(None, databases=["default"]), [])
+        self.assertEqual(task_counts(), self.actual_counts())
+        self.assertEqual(self.search("cafe"), ["Café oublié"])
+        Task.objects.create(title="After")
+        self.assertEqual(task_counts(), self.actual_counts())
+        self.assertEqual(self.search("after"), ["After"])
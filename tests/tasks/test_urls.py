@@ -15,3 +15,7 @@ class TasksUrlsTests(SimpleTestCase):
     def test_update_and_delete_urls_exist(self):
         self.assertEqual(resolve(reverse("update_task", args=[1])).view_name, "update_task")
         self.assertEqual(resolve(reverse("delete_task", args=[1])).view_name, "delete_task")
+
+    @tc("TC025")
+    def test_export_url_exists(self):
+        self.assertEqual(resolve(reverse("export_tasks", args=["csv"])).view_name, "export_tasks")
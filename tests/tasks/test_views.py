@@ -1,6 +1,9 @@
+import json
+
 from django.test import TestCase
 from django.urls import reverse
 
+from tasks.dataset import aiter_export
 from tasks.models import Task
 
 from ..decorators import tc
@@ -112,3 +115,122 @@ class TaskViewsTests(TestCase):
 
         self.task.refresh_from_db()
         self.assertEqual(self.task.title, "Existing task")
+
+
+class ExportViewTests(TestCase):
+    def setUp(self):
+        Task.objects.create(title="Open task", complete=False)
+        Task.objects.create(title="Done task", complete=True)
+
+    @tc("TC025")
+    def test_export_ndjson_is_streamed_and_filtered(self):
+        response = self.client.get(reverse("export_tasks", args=["ndjson"]), {"status": "done"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual([json.loads(line)["title"] for line in body.splitlines()], ["Done task"])
+
+    @tc("TC025")
+    def test_export_csv_has_header(self):
+        response = self.client.get(reverse("export_tasks", args=["csv"]))
+
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(body.splitlines()[0], "title,complete,created")
+        self.assertEqual(len(body.splitlines()), 3)
+
+    @tc("TC025")
+    async def test_export_is_streamed_asynchronously_under_asgi(self):
+        response = await self.async_client.get(reverse("export_tasks", args=["json"]))
+
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual([task["title"] for task in json.loads(body)], ["Open task", "Done task"])
+
+        chunks = [chunk async for chunk in aiter_export(Task.objects.all(), "ndjson", chunk_size=1)]
+        self.assertEqual(len(chunks), 2)
+
+    @tc("TC025")
+    def test_export_rejects_unknown_format_and_bad_since(self):
+        self.assertEqual(self.client.get("/export.xml").status_code, 404)
+        response = self.client.get(reverse("export_tasks", args=["json"]), {"since": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(title="Existing task", complete=False)
+        # The first response sets the CSRF cookie, which is part of the validators.
+        self.client.get(reverse("list"))
+
+    @tc("TC027")
+    def test_list_returns_304_until_a_task_changes(self):
+        etag = self.client.get(reverse("list"))["ETag"]
+
+        response = self.client.get(reverse("list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Task.objects.create(title="Another task")
+        response = self.client.get(reverse("list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @tc("TC027")
+    def test_list_etag_depends_on_filter(self):
+        etag = self.client.get(reverse("list"))["ETag"]
+        response = self.client.get(reverse("list"), {"status": "open"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @tc("TC027")
+    def test_task_pages_use_modified_timestamp(self):
+        url = reverse("update_task", args=[self.task.id])
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        delete_url = reverse("delete_task", args=[self.task.id])
+        delete_etag = self.client.get(delete_url)["ETag"]
+        self.assertEqual(self.client.get(delete_url, HTTP_IF_NONE_MATCH=delete_etag).status_code, 304)
+
+        modified = self.task.modified
+        self.task.complete = True
+        self.task.save()
+        self.assertGreater(self.task.modified, modified)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class FragmentResponseTests(TestCase):
+    def setUp(self):
+        self.task = Task.objects.create(title="Existing task", complete=False)
+
+    @tc("TC030")
+    def test_create_returns_only_the_new_row(self):
+        response = self.client.post(reverse("list"), {"title": "Fragment task"}, HTTP_HX_REQUEST="true")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTemplateUsed(response, "tasks/task_row.html")
+        self.assertTemplateNotUsed(response, "tasks/list.html")
+        self.assertContains(response, "Fragment task", status_code=201)
+        self.assertNotContains(response, "Existing task", status_code=201)
+
+    @tc("TC030")
+    def test_update_returns_the_row_and_invalid_returns_errors(self):
+        url = reverse("update_task", args=[self.task.id])
+
+        response = self.client.post(url, {"title": "Renamed", "complete": True}, HTTP_ACCEPT="text/html+fragment")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'id="task-{self.task.id}"')
+        self.assertContains(response, "<strike>Renamed</strike>")
+
+        response = self.client.post(url, {"title": ""}, HTTP_HX_REQUEST="true")
+        self.assertEqual(response.status_code, 422)
+
+    @tc("TC030")
+    def test_delete_returns_204(self):
+        response = self.client.post(reverse("delete_task", args=[self.task.id]), HTTP_HX_REQUEST="true")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b"")
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
@@ -0,0 +1,94 @@
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from ..decorators import tc
+from ..json_test_runner import JsonRemoteTestResult, JsonTestResult, RemoteTestError
+
+LABELS = ("tests.tasks.test_forms", "tests.tasks.test_pagination", "tests.tasks.test_filters")
+
+
+class Unpicklable(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.lock = threading.Lock()
+
+
+def sample_case():
+    # Built on demand, so the test discovery does not run it.
+    class Sample(unittest.TestCase):
+        @tc("TC000")
+        def test_passes(self):
+            pass
+
+        @tc("TC000")
+        def test_fails(self):
+            raise Unpicklable("boom")
+
+    return Sample
+
+
+class JsonTestRunnerTests(SimpleTestCase):
+    def run_tests(self, path, parallel):
+        # On SQLite next to the report: a PostgreSQL DATABASE_URL would make
+        # the child create the test database this run is using.
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "todo.settings",
+            "DATABASE_URL": f"sqlite:///{Path(path).parent}/db.sqlite3",
+        }
+        subprocess.run(
+            [sys.executable, "manage.py", "test", *LABELS, "--parallel", str(parallel), "--json-path", path],
+            capture_output=True, check=True, cwd=settings.BASE_DIR, env=env,
+        )
+        return Path(path).read_text(encoding="utf-8")
+
+    @tc("TC044")
+    def test_parallel_run_writes_the_same_report_as_a_serial_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            serial = self.run_tests(f"{tmp}/serial.json", 1)
+            parallel = self.run_tests(f"{tmp}/parallel.json", 3)
+
+        self.assertEqual(parallel, serial)
+        records = json.loads(parallel)["tests"]
+        self.assertEqual({record["module"] for record in records}, set(LABELS))
+        self.assertEqual([record["test_name"] for record in records], sorted(record["test_name"] for record in records))
+        self.assertTrue(all(record["test_case_id"] and record["status"] == "passed" for record in records))
+
+    @tc("TC044")
+    def test_worker_failures_reach_the_report_even_when_unpicklable(self):
+        remote = JsonRemoteTestResult()
+        sample = sample_case()
+        failing, passing = sample("test_fails"), sample("test_passes")
+        failing.run(remote)
+        passing.run(remote)
+
+        # What a worker sends back to the main process.
+        events = pickle.loads(pickle.dumps(remote.events))
+        error = next(event for event in events if event[0] == "addError")
+        exc_type, exc, tb = error[2]
+        self.assertIs(exc_type, RemoteTestError)
+        self.assertIn("Unpicklable: boom", str(exc))
+        self.assertIn("Traceback (most recent call last)", str(exc))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            result = JsonTestResult(unittest.runner._WritelnDecorator(io.StringIO()), False, 0, json_path=f"{tmp}/report.json")
+            result.addError(failing, error[2])
+            result.addSuccess(passing)
+            result.stopTestRun()
+            records = json.loads(Path(tmp, "report.json").read_text(encoding="utf-8"))["tests"]
+
+        self.assertEqual(
+            [(record["method"], record["status"], record["test_case_id"]) for record in records],
+            [("test_fails", "error", "TC000"), ("test_passes", "passed", "TC000")],
+        )
@@ -0,0 +1,112 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from ..decorators import tc
+
+SERVE_CHECK = """
+import json, sys
+import django
+django.setup()
+from django.urls import Resolver404, get_resolver, resolve
+
+get_resolver().url_patterns
+
+def routed(path):
+    try:
+        return resolve(path).url_name
+    except Resolver404:
+        return None
+
+print(json.dumps({
+    "contrib": sorted({m.split(".")[2] for m in sys.modules if m.startswith("django.contrib.")}),
+    "routes": {path: routed(path) for path in ("/", "/sync", "/metrics", "/admin/")},
+}))
+"""
+
+
+# The production profiles refuse to load without a secret key.
+PRODUCTION_ENV = {**os.environ, "DJANGO_SECRET_KEY": "test-only"}
+
+
+def import_profile(name):
+    with mock.patch.dict(os.environ, {"DJANGO_SECRET_KEY": "test-only"}):
+        return importlib.import_module(name)
+
+
+class SettingsProfilesTests(SimpleTestCase):
+    @tc("TC042")
+    def test_serve_profile_only_loads_what_the_task_views_need(self):
+        serve = import_profile("todo.settings.serve")
+        self.assertEqual(serve.INSTALLED_APPS, ["django.contrib.staticfiles", "tasks"])
+        self.assertEqual(serve.MIDDLEWARE[0], "tasks.middleware.MetricsMiddleware")
+        self.assertLess(len(serve.MIDDLEWARE), len(settings.MIDDLEWARE))
+        for removed in ("sessions", "auth", "messages"):
+            self.assertFalse(any(removed in middleware for middleware in serve.MIDDLEWARE), removed)
+        self.assertFalse(serve.DEBUG)
+        self.assertEqual(serve.SQLITE_PRAGMAS["journal_mode"], "WAL")
+
+        result = subprocess.run(
+            [sys.executable, "-c", SERVE_CHECK],
+            capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+            env={**PRODUCTION_ENV, "DJANGO_SETTINGS_MODULE": "todo.settings.serve"},
+        )
+        loaded = json.loads(result.stdout)
+        self.assertEqual(loaded["contrib"], ["staticfiles"])
+        self.assertEqual(loaded["routes"], {"/": "list", "/sync": "sync", "/metrics": "metrics", "/admin/": None})
+
+    @tc("TC042")
+    def test_admin_and_production_profiles_keep_every_app(self):
+        admin = import_profile("todo.settings.admin")
+        production = import_profile("todo.settings.production")
+        legacy = import_profile("todo.settings_production")
+
+        self.assertIn("django.contrib.admin", admin.INSTALLED_APPS)
+        self.assertEqual(admin.MIDDLEWARE, settings.MIDDLEWARE)
+        self.assertFalse(admin.DEBUG)
+        self.assertEqual(legacy.SQLITE_PRAGMAS, production.SQLITE_PRAGMAS)
+        self.assertEqual(legacy.STORAGES, production.STORAGES)
+
+    @tc("TC042")
+    def test_default_profile_is_the_base_settings(self):
+        self.assertEqual(settings.SETTINGS_MODULE, "todo.settings")
+        self.assertTrue((settings.BASE_DIR / "manage.py").is_file())
+        self.assertEqual(settings.STATIC_ROOT, settings.BASE_DIR / "staticfiles")
+
+    @tc("TC042")
+    def test_production_cache_is_shared_between_processes(self):
+        production = import_profile("todo.settings.production")
+        self.assertNotIn("locmem", production.CACHES["default"]["BACKEND"])
+
+        bump = "import django; django.setup(); from tasks.cache import bump_version; print(bump_version())"
+        with tempfile.TemporaryDirectory() as location:
+            env = {**PRODUCTION_ENV, "DJANGO_SETTINGS_MODULE": "todo.settings.production", "DJANGO_CACHE_DIR": location}
+            versions = [
+                int(subprocess.run(
+                    [sys.executable, "-c", bump], capture_output=True, text=True, check=True,
+                    cwd=settings.BASE_DIR, env=env,
+                ).stdout)
+                for _ in range(2)
+            ]
+        self.assertEqual(versions[1], versions[0] + 1)
+
+    @tc("TC042")
+    def test_production_profiles_need_a_secret_key(self):
+        self.assertEqual(import_profile("todo.settings.production").SECRET_KEY, "test-only")
+
+        env = {key: value for key, value in os.environ.items() if key != "DJANGO_SECRET_KEY"}
+        for profile in ("todo.settings.production", "todo.settings.serve", "todo.settings.admin"):
+            with self.subTest(profile=profile):
+                result = subprocess.run(
+                    [sys.executable, "manage.py", "check"], capture_output=True, text=True,
+                    cwd=settings.BASE_DIR, env={**env, "DJANGO_SETTINGS_MODULE": profile},
+                )
+                self.assertNotEqual(result.returncode, 0)
+                self.assertIn("DJANGO_SECRET_KEY must be set", result.stderr)
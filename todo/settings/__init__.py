@@ -0,0 +1,10 @@
+"""
+Settings profiles of the todo project, selected with DJANGO_SETTINGS_MODULE:
+
+- todo.settings: development, every app and middleware (todo.settings.base)
+- todo.settings.production: production tuning of SQLite and static files
+- todo.settings.serve: production, with only what the task views need
+- todo.settings.admin: production, for the workers serving /admin/
+"""
+
+from todo.settings.base import *  # noqa: F401,F403
@@ -0,0 +1,7 @@
+"""
+Admin profile: todo.settings.production with every app and middleware, for
+the workers serving /admin/ (route the rest to todo.settings.serve workers)
+and for management commands such as migrate and createsuperuser.
+"""
+
+from todo.settings.production import *  # noqa: F401,F403
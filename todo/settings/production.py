@@ -0,0 +1,76 @@
+"""
+Production profile for the todo project, on top of todo.settings.base.
+
+Use it with DJANGO_SETTINGS_MODULE=todo.settings.production, or through the
+todo.settings.serve and todo.settings.admin profiles built on it. It tunes SQLite
+for concurrent access: WAL journaling so readers never block behind the
+writer, a busy timeout instead of immediate "database is locked" errors, a
+memory-mapped and larger page cache, and synchronous=NORMAL (durable in WAL
+mode up to the last checkpointed transaction on power loss).
+
+The default cache is file-based, so that every worker process of a host sees
+the same task-set version (tasks.cache): with the per-process local-memory
+cache, a worker would keep serving fragments and ETags of a version it never
+saw bumped. Deployments spanning several hosts should point CACHES at a
+networked backend (Redis, Memcached, database) instead.
+
+SECRET_KEY must be set through DJANGO_SECRET_KEY: the key of
+todo.settings.base is public, so the profile refuses to start without one.
+
+Static files are content-hashed and precompressed (gzip, plus brotli when the
+brotli package is installed) by `manage.py collectstatic`, which must run on
+each deployment before the server starts.
+"""
+
+import os
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+from todo.settings.base import *  # noqa: F401,F403
+from todo.settings.base import BASE_DIR, DATABASES
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "")
+if not SECRET_KEY:
+    raise ImproperlyConfigured("DJANGO_SECRET_KEY must be set with the production settings.")
+
+ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # Seconds the sqlite3 driver waits on a locked database before raising.
+    DATABASES["default"].setdefault("OPTIONS", {})["timeout"] = 20
+    if django.VERSION >= (5, 1):
+        # Take the write lock when the transaction starts, so busy_timeout applies
+        # instead of failing on a read-to-write lock upgrade.
+        DATABASES["default"]["OPTIONS"]["transaction_mode"] = "IMMEDIATE"
+
+# Applied to every new SQLite connection by tasks.db.configure_sqlite.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "busy_timeout": 20000,
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # in KiB when negative
+    "temp_store": "MEMORY",
+}
+
+# Retries of writes that still hit "database is locked" (see tasks.db.retry_on_locked).
+SQLITE_LOCK_RETRIES = 5
+SQLITE_LOCK_BACKOFF = 0.05
+
+# Shared by the worker processes of `manage.py serve` (see the docstring above).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("DJANGO_CACHE_DIR", BASE_DIR / "cache"),
+    },
+}
+
+# Hashed, precompressed static files, served with immutable cache headers by
+# tasks.staticfiles.serveStatic.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "tasks.staticfiles.CompressedManifestStaticFilesStorage"},
+}
@@ -0,0 +1,42 @@
+"""
+Lean serving profile: todo.settings.production with only what the task views
+(list, update, delete, API, /sync, /events, /metrics) need.
+
+Admin, auth, contenttypes, sessions and messages are not installed, so
+django.setup() imports and checks less and each request crosses five
+middlewares instead of eight: workers start faster when autoscaling. /admin/
+is not routed by this profile; send it to workers running todo.settings.admin,
+which is also the profile to run `manage.py migrate` with.
+"""
+
+from todo.settings.production import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'django.contrib.staticfiles',
+    'tasks',
+]
+
+# CSRF tokens are kept in a cookie (CSRF_USE_SESSIONS is off), so CSRF
+# protection needs no session.
+MIDDLEWARE = [
+    'tasks.middleware.MetricsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+AUTH_PASSWORD_VALIDATORS = []
@@ -0,0 +1,3 @@
+"""Former location of the production profile, kept for existing deployments: see todo.settings.production."""
+
+from todo.settings.production import *  # noqa: F401,F403
@@ -13,10 +13,22 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
-from django.urls import include, path
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.urls import include, path, re_path
+
+from tasks.staticfiles import serveStatic
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    # Collected assets (STATIC_ROOT); runserver serves them itself in DEBUG
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.STATIC_URL.lstrip('/')), serveStatic, name="static"),
     path('', include('tasks.urls'))
 ]
+
+# Not installed in the lean todo.settings.serve profile (nor imported there).
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))